@@ -0,0 +1,10 @@
+"""
+Общие средства замеров производительности для лабораторных работ.
+"""
+from .harness import (Measurement, measure, peak_memory, run_sweep, benchmark,
+                      environment_info, write_json, write_csv)
+from .parallel import available_cpus, run_sweep_parallel
+from .baseline import Regression, load_baseline, compare
+from .cli import make_parser, plot_results, run
+from .scaling import (ScalingPoint, SCALING_FIELDS, measure_point, run_scaling, fit_exponent,
+                      GrowthReport, growth_reports)
@@ -0,0 +1,65 @@
+import json
+
+
+class Regression:
+    """
+    Замедление одной серии на одном n относительно базовой линии.
+
+    ratio: отношение текущего значения метрики к базовому
+    """
+
+    def __init__(self, name: str, n, metric: str, baseline: float, current: float):
+        self.name = name
+        self.n = n
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def __str__(self):
+        return (f"{self.name}, n={self.n}: {self.metric} {self.baseline:.6g} -> "
+                f"{self.current:.6g} с (+{(self.ratio - 1) * 100:.1f}%)")
+
+    def __repr__(self):
+        return f"Regression({self.name!r}, n={self.n!r}, ratio={self.ratio:.3f})"
+
+
+def load_baseline(file) -> dict:
+    """
+    Читает JSON, записанный write_json.
+
+    Возвращает словарь {(имя серии, n): запись с метриками}.
+    """
+    if hasattr(file, 'read'):
+        document = json.load(file)
+    else:
+        with open(file, encoding='utf-8') as f:
+            document = json.load(f)
+    if 'results' not in document:
+        raise KeyError("В файле базовой линии отсутствует ключ 'results'")
+    return {(record['name'], record['n']): record for record in document['results']}
+
+
+def compare(results: dict, baseline: dict, threshold=0.1, metric='min') -> list:
+    """
+    Сравнивает результаты run_sweep с базовой линией.
+
+    threshold: допустимое относительное замедление (0.1 = 10%)
+    metric: сравниваемая метрика Measurement (min, median, p95, mean)
+    Серии и n, отсутствующие в базовой линии, пропускаются.
+    """
+    if threshold < 0:
+        raise ValueError("threshold не может быть отрицательным")
+    regressions = []
+    for name, series in results.items():
+        for measurement in series:
+            record = baseline.get((name, measurement.n))
+            if record is None or not record.get(metric):
+                continue
+            current = getattr(measurement, metric)
+            if current > record[metric] * (1 + threshold):
+                regressions.append(Regression(name, measurement.n, metric, record[metric], current))
+    return regressions
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+
+from .baseline import load_baseline, compare
+from .harness import run_sweep, write_json, write_csv
+from .parallel import run_sweep_parallel
+
+
+def make_parser(description: str) -> argparse.ArgumentParser:
+    """Общие параметры командной строки для сценариев замеров"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров на каждое n")
+    parser.add_argument("--warmup", type=int, default=1, help="число прогревочных запусков")
+    parser.add_argument("--no-memory", action="store_true", help="не снимать пик памяти")
+    parser.add_argument("--json", help="сохранить результаты в JSON-файл")
+    parser.add_argument("--csv", help="сохранить результаты в CSV-файл")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="число процессов для замеров (0 - по одному на ядро, 1 - последовательно)")
+    parser.add_argument("--no-pin", action="store_true",
+                        help="не закреплять процессы за ядрами при --jobs")
+    parser.add_argument("--plot", help="сохранить график в файл вместо показа окна")
+    parser.add_argument("--headless", action="store_true",
+                        help="не показывать окно с графиком (для пакетного запуска)")
+    parser.add_argument("--baseline",
+                        help="JSON с базовой линией: сравнить с ним, а если его нет - создать")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="после сравнения перезаписать базовую линию текущими результатами")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="допустимое замедление относительно базовой линии (0.1 = 10%%)")
+    parser.add_argument("--metric", default="min", choices=["min", "median", "p95", "mean"],
+                        help="метрика для сравнения с базовой линией")
+    return parser
+
+
+def plot_results(results: dict, test_data, title: str, xlabel="n", output=None, show=True):
+    """
+    Строит график времени (метрика min) для каждой серии.
+
+    output: путь к файлу изображения; если задан, окно не показывается
+    show: показывать ли окно (plt.show блокирует и требует дисплея)
+    """
+    import matplotlib
+    if output or not show:
+        matplotlib.use("Agg")  # без дисплея
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    for label, series in results.items():
+        plt.plot(test_data, [m.min for m in series], label=label)
+    plt.xlabel(xlabel)
+    plt.ylabel("Время (сек)")
+    plt.title(title)
+    plt.legend()
+    if output:
+        plt.savefig(output)
+    elif show:
+        plt.show()
+    plt.close()
+
+
+def run(funcs: dict, test_data, args, title: str, xlabel="n", stream=sys.stdout) -> int:
+    """
+    Выполняет замеры по параметрам make_parser.
+
+    Возвращает код завершения: 1, если найдено замедление сверх
+    порога относительно базовой линии, иначе 0.
+    """
+    if args.jobs == 1:
+        results = run_sweep(funcs, test_data, repeat=args.repeat,
+                            warmup=args.warmup, trace_memory=not args.no_memory)
+    else:
+        results = run_sweep_parallel(funcs, test_data, workers=args.jobs or None,
+                                     pin_cpus=not args.no_pin, repeat=args.repeat,
+                                     warmup=args.warmup, trace_memory=not args.no_memory)
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.plot or not args.headless:
+        plot_results(results, test_data, title, xlabel, output=args.plot, show=not args.headless)
+
+    exit_code = 0
+    if args.baseline:
+        if os.path.exists(args.baseline):
+            regressions = compare(results, load_baseline(args.baseline),
+                                  threshold=args.threshold, metric=args.metric)
+            for regression in regressions:
+                stream.write(f"ЗАМЕДЛЕНИЕ: {regression}\n")
+            if regressions:
+                stream.write(f"Найдено замедлений: {len(regressions)}\n")
+                exit_code = 1
+            else:
+                stream.write("Замедлений относительно базовой линии нет\n")
+            if args.update_baseline:
+                write_json(results, args.baseline)
+        else:
+            write_json(results, args.baseline)
+            stream.write(f"Базовая линия сохранена в {args.baseline}\n")
+    return exit_code
@@ -0,0 +1,180 @@
+import csv
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+
+class Measurement:
+    """
+    Результат замеров одной функции на одном размере данных.
+
+    name: имя функции (серии)
+    n: размер данных
+    times: время каждого повтора в секундах
+    peak_memory: пик выделенной памяти по tracemalloc в байтах (или None)
+    """
+
+    def __init__(self, name: str, n, times: list, peak_memory=None):
+        if not times:
+            raise ValueError("Нужен хотя бы один замер времени")
+        self.name = name
+        self.n = n
+        self.times = list(times)
+        self.peak_memory = peak_memory
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.times)
+
+    @property
+    def p95(self) -> float:
+        """95-й перцентиль методом ближайшего ранга"""
+        ordered = sorted(self.times)
+        rank = math.ceil(0.95 * len(ordered))
+        return ordered[rank - 1]
+
+    @property
+    def stddev(self) -> float:
+        if len(self.times) < 2:
+            return 0.0
+        return statistics.stdev(self.times)
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'n': self.n,
+            'repeat': len(self.times),
+            'min': self.min,
+            'median': self.median,
+            'p95': self.p95,
+            'mean': self.mean,
+            'stddev': self.stddev,
+            'peak_memory': self.peak_memory,
+        }
+
+    def __repr__(self):
+        return f"Measurement({self.name!r}, n={self.n!r}, min={self.min:.6g})"
+
+
+CSV_FIELDS = ['name', 'n', 'repeat', 'min', 'median', 'p95', 'mean', 'stddev', 'peak_memory']
+
+
+def peak_memory(func, *args) -> int:
+    """Пик памяти (байты), выделенной Python за один вызов func(*args)"""
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    else:
+        tracemalloc.start()
+        before = 0
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def measure(func, *args, name=None, n=None, repeat=5, warmup=1, number=1, trace_memory=True) -> Measurement:
+    """
+    Замеряет время выполнения func(*args).
+
+    warmup: число прогревочных запусков, которые не учитываются
+    repeat: число замеров
+    number: число вызовов в одном замере (время делится на number)
+    trace_memory: отдельным запуском снять пик памяти через tracemalloc,
+                  чтобы трассировка не искажала замеры времени
+    """
+    if repeat < 1:
+        raise ValueError("repeat должен быть положительным")
+    if number < 1:
+        raise ValueError("number должен быть положительным")
+
+    call = lambda: func(*args)
+    for _ in range(warmup):
+        call()
+    times = [t / number for t in timeit.repeat(call, number=number, repeat=repeat)]
+    memory = peak_memory(func, *args) if trace_memory else None
+    if name is None:
+        name = getattr(func, '__name__', repr(func))
+    if n is None and len(args) == 1:
+        n = args[0]
+    return Measurement(name, n, times, memory)
+
+
+def run_sweep(funcs: dict, test_data, repeat=5, warmup=1, number=1, trace_memory=True) -> dict:
+    """
+    Замеряет каждую функцию на каждом n из test_data.
+
+    funcs: словарь {имя серии: функция от одного аргумента n}
+    Возвращает словарь {имя серии: [Measurement для каждого n]}
+    в порядке test_data, пригодный для построения графиков.
+    """
+    results = {name: [] for name in funcs}
+    for n in test_data:
+        for name, func in funcs.items():
+            results[name].append(
+                measure(func, n, name=name, n=n, repeat=repeat, warmup=warmup,
+                        number=number, trace_memory=trace_memory)
+            )
+    return results
+
+
+def environment_info() -> dict:
+    """Сведения об окружении, сохраняемые вместе с результатами"""
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def _flatten(results: dict) -> list:
+    return [m.as_dict() for series in results.values() for m in series]
+
+
+def write_json(results: dict, file):
+    """Записывает результаты run_sweep в JSON (путь или файловый объект)"""
+    document = {'environment': environment_info(), 'results': _flatten(results)}
+    if hasattr(file, 'write'):
+        json.dump(document, file, indent=2, ensure_ascii=False)
+        return
+    with open(file, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def write_csv(results: dict, file, fields=CSV_FIELDS):
+    """
+    Записывает результаты run_sweep в CSV (путь или файловый объект).
+    fields: столбцы - ключи as_dict() результатов
+    """
+    if hasattr(file, 'write'):
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(_flatten(results))
+        return
+    with open(file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(_flatten(results))
+
+
+def benchmark(func, n, repeat=5) -> float:
+    """Минимальное время выполнения func(n) - краткая форма measure"""
+    return measure(func, n, repeat=repeat, warmup=0, trace_memory=False).min
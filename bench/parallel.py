@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .harness import measure
+
+
+def available_cpus() -> list:
+    """Номера ядер, на которых разрешено выполнение текущего процесса"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_worker(counter, cpus):
+    """Инициализатор процесса: закрепляет его за отдельным ядром"""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+
+def _measure_job(name, func, n, repeat, warmup, number, trace_memory):
+    return measure(func, n, name=name, n=n, repeat=repeat, warmup=warmup,
+                   number=number, trace_memory=trace_memory)
+
+
+def run_sweep_parallel(funcs: dict, test_data, workers=None, pin_cpus=True,
+                       repeat=5, warmup=1, number=1, trace_memory=True) -> dict:
+    """
+    То же, что run_sweep, но замеры выполняются в пуле процессов.
+
+    workers: число процессов (по умолчанию - по одному на доступное ядро)
+    pin_cpus: закрепить каждый процесс за своим ядром (только Linux),
+              чтобы замеры не мешали друг другу и не мигрировали между ядрами
+    Функции должны быть доступны для pickle (определены на уровне модуля).
+    Возвращает словарь {имя серии: [Measurement для каждого n]}.
+    """
+    cpus = available_cpus()
+    if workers is None:
+        workers = len(cpus)
+    if workers < 1:
+        raise ValueError("workers должен быть положительным")
+
+    initializer, initargs = None, ()
+    if pin_cpus and hasattr(os, 'sched_setaffinity'):
+        initializer, initargs = _pin_worker, (multiprocessing.Value('i', 0), cpus)
+
+    test_data = list(test_data)
+    results = {name: [None] * len(test_data) for name in funcs}
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        futures = {}
+        # большие n отправляем первыми, чтобы в конце не ждать одну долгую задачу
+        for i in reversed(range(len(test_data))):
+            n = test_data[i]
+            for name, func in funcs.items():
+                future = pool.submit(_measure_job, name, func, n, repeat, warmup,
+                                     number, trace_memory)
+                futures[future] = (name, i)
+        for future, (name, i) in futures.items():
+            results[name][i] = future.result()
+    return results
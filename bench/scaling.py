@@ -0,0 +1,206 @@
+import gc
+import math
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class ScalingPoint:
+    """
+    Замер одной функции на одном размере с учётом памяти.
+
+    items: число элементов результата (например, узлов дерева)
+    seconds: время одного вызова
+    tracemalloc_peak: пик памяти Python по tracemalloc, байты
+    rss_peak: прирост пикового RSS процесса, байты (None, если недоступно)
+    blocks: число блоков памяти, занятых результатом (sys.getallocatedblocks)
+    """
+
+    def __init__(self, name: str, n, items: int, seconds: float, tracemalloc_peak: int,
+                 rss_peak=None, blocks=None):
+        self.name = name
+        self.n = n
+        self.items = items
+        self.seconds = seconds
+        self.tracemalloc_peak = tracemalloc_peak
+        self.rss_peak = rss_peak
+        self.blocks = blocks
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else math.inf
+
+    @property
+    def bytes_per_item(self) -> float:
+        return self.tracemalloc_peak / self.items
+
+    @property
+    def blocks_per_item(self):
+        return None if self.blocks is None else self.blocks / self.items
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'n': self.n,
+            'items': self.items,
+            'seconds': self.seconds,
+            'items_per_second': self.items_per_second,
+            'tracemalloc_peak': self.tracemalloc_peak,
+            'bytes_per_item': self.bytes_per_item,
+            'rss_peak': self.rss_peak,
+            'blocks': self.blocks,
+            'blocks_per_item': self.blocks_per_item,
+        }
+
+    def __repr__(self):
+        return f"ScalingPoint({self.name!r}, n={self.n!r}, items={self.items})"
+
+
+SCALING_FIELDS = ['name', 'n', 'items', 'seconds', 'items_per_second', 'tracemalloc_peak',
+                  'bytes_per_item', 'rss_peak', 'blocks', 'blocks_per_item']
+
+
+def _current_rss():
+    '''Текущий RSS процесса в байтах (Linux) или None'''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss():
+    '''Пиковый RSS процесса в байтах или None'''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # в Linux - килобайты
+
+
+def measure_point(func, n, items: int, name=None) -> ScalingPoint:
+    '''
+    Замеряет func(n) в текущем процессе.
+
+    Первый вызов - без трассировки: время, прирост пикового RSS и число
+    блоков памяти, которые держит результат. Второй - под tracemalloc
+    для пика памяти Python. Пик RSS осмыслен только в свежем процессе
+    (см. run_scaling с isolate=True), иначе он может быть занят прошлыми замерами.
+    '''
+    gc.collect()
+    rss_start = _current_rss()
+    blocks_before = sys.getallocatedblocks()
+    start = time.perf_counter()
+    result = func(n)
+    seconds = time.perf_counter() - start
+    blocks = sys.getallocatedblocks() - blocks_before
+    del result
+    peak = _max_rss()
+    rss_peak = max(0, peak - rss_start) if peak is not None and rss_start is not None else None
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(n)
+        traced = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if name is None:
+        name = getattr(func, '__name__', repr(func))
+    return ScalingPoint(name, n, items, seconds, traced, rss_peak, blocks)
+
+
+def run_scaling(funcs: dict, sizes, items_of=lambda n: n, isolate=True) -> dict:
+    '''
+    Замеряет каждую функцию на каждом размере с учётом памяти.
+
+    funcs: словарь {имя серии: функция от n}
+    items_of: число элементов результата для размера n
+              (для дерева высоты h - 2**h - 1 узлов)
+    isolate: каждый замер в новом процессе (spawn), чтобы пиковый RSS
+             относился только к нему; функции должны передаваться через pickle
+    Возвращает словарь {имя серии: [ScalingPoint для каждого n]}.
+    '''
+    results = {name: [] for name in funcs}
+    context = multiprocessing.get_context('spawn') if isolate else None
+    for n in sizes:
+        for name, func in funcs.items():
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    point = pool.submit(measure_point, func, n, items_of(n), name).result()
+            else:
+                point = measure_point(func, n, items_of(n), name)
+            results[name].append(point)
+    return results
+
+
+def fit_exponent(xs, ys):
+    '''
+    Показатель k в зависимости y ~ c * x**k (метод наименьших квадратов
+    в логарифмах). 1 - линейный рост, больше 1 - сверхлинейный.
+    Возвращает None, если пригодных точек меньше двух.
+    '''
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+class GrowthReport:
+    """Показатели роста времени и памяти одной серии от числа элементов"""
+
+    def __init__(self, name: str, time_exponent, memory_exponent, tolerance: float):
+        self.name = name
+        self.time_exponent = time_exponent
+        self.memory_exponent = memory_exponent
+        self.tolerance = tolerance
+
+    @property
+    def superlinear(self) -> list:
+        '''Метрики, растущие быстрее линейного с учётом допуска'''
+        flagged = []
+        for metric, exponent in (('время', self.time_exponent), ('память', self.memory_exponent)):
+            if exponent is not None and exponent > 1 + self.tolerance:
+                flagged.append(metric)
+        return flagged
+
+    def __str__(self):
+        def fmt(exponent):
+            return '-' if exponent is None else f"{exponent:.2f}"
+        text = f"{self.name}: время ~ N^{fmt(self.time_exponent)}, память ~ N^{fmt(self.memory_exponent)}"
+        if self.superlinear:
+            text += f" (СВЕРХЛИНЕЙНО: {', '.join(self.superlinear)})"
+        return text
+
+
+def growth_reports(results: dict, min_items=1000, tolerance=0.2) -> list:
+    '''
+    Оценивает рост каждой серии run_scaling.
+
+    min_items: точки с меньшим числом элементов не учитываются
+               (на малых размерах доминируют постоянные накладные расходы)
+    tolerance: допуск над линейным ростом, после которого серия помечается
+    '''
+    reports = []
+    for name, points in results.items():
+        points = [p for p in points if p.items >= min_items]
+        items = [p.items for p in points]
+        reports.append(GrowthReport(
+            name,
+            fit_exponent(items, [p.seconds for p in points]),
+            fit_exponent(items, [p.tracemalloc_peak for p in points]),
+            tolerance,
+        ))
+    return reports
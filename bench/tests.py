@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from bench.baseline import load_baseline, compare
+from bench.cli import make_parser, run
+from bench.harness import Measurement, measure, run_sweep, write_json, write_csv
+from bench.parallel import run_sweep_parallel
+from bench.scaling import ScalingPoint, fit_exponent, growth_reports, run_scaling
+
+
+class TestMeasurement(unittest.TestCase):
+
+    def test_statistics(self):
+        """Проверка min/median/p95/stddev на известном наборе"""
+        m = Measurement("f", 10, [float(t) for t in range(1, 21)])
+        self.assertEqual(m.min, 1.0)
+        self.assertEqual(m.median, 10.5)
+        self.assertEqual(m.p95, 19.0)
+        self.assertAlmostEqual(m.stddev, 5.9160797831)
+        self.assertEqual(Measurement("f", 1, [2.0]).stddev, 0.0)
+
+    def test_empty_times(self):
+        """Проверка выброса ValueError без замеров"""
+        with self.assertRaises(ValueError):
+            Measurement("f", 1, [])
+
+
+class TestMeasure(unittest.TestCase):
+
+    def test_warmup_and_repeat(self):
+        """Прогрев и замеры вызывают функцию нужное число раз"""
+        calls = []
+        m = measure(calls.append, 7, repeat=3, warmup=2, trace_memory=False)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(m.n, 7)
+        self.assertEqual(len(m.times), 3)
+        self.assertIsNone(m.peak_memory)
+
+    def test_peak_memory(self):
+        """Пик памяти отражает размер созданного объекта"""
+        m = measure(lambda n: [0] * n, 100000, repeat=1, warmup=0)
+        self.assertGreaterEqual(m.peak_memory, 100000 * 8)
+
+
+class TestOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.results = run_sweep({"sum": lambda n: sum(range(n))}, [10, 20],
+                                 repeat=2, warmup=0)
+
+    def test_json(self):
+        """Проверка структуры JSON-вывода"""
+        out = io.StringIO()
+        write_json(self.results, out)
+        document = json.loads(out.getvalue())
+        self.assertIn("environment", document)
+        self.assertEqual([r["n"] for r in document["results"]], [10, 20])
+        self.assertEqual(document["results"][0]["repeat"], 2)
+
+    def test_csv(self):
+        """Проверка структуры CSV-вывода"""
+        out = io.StringIO()
+        write_csv(self.results, out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["name"], "sum")
+        self.assertEqual(rows[1]["n"], "20")
+
+
+def square_sum(n):
+    return sum(i * i for i in range(n))
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_same_structure_as_serial(self):
+        """Параллельные замеры собираются в ту же структуру серий"""
+        funcs = {"a": square_sum, "b": abs}
+        results = run_sweep_parallel(funcs, [5, 50, 500], workers=2, repeat=2,
+                                     warmup=0, trace_memory=False)
+        self.assertEqual(list(results), ["a", "b"])
+        for name in funcs:
+            self.assertEqual([m.n for m in results[name]], [5, 50, 500])
+            self.assertTrue(all(m.name == name for m in results[name]))
+
+
+def make_list(n):
+    return [object() for _ in range(n)]
+
+
+class TestScaling(unittest.TestCase):
+
+    def test_fit_exponent(self):
+        """Показатель степени восстанавливается по точным данным"""
+        xs = [10, 100, 1000, 10000]
+        self.assertAlmostEqual(fit_exponent(xs, [3 * x for x in xs]), 1.0)
+        self.assertAlmostEqual(fit_exponent(xs, [x ** 2 for x in xs]), 2.0)
+        self.assertIsNone(fit_exponent([10], [1]))
+        self.assertIsNone(fit_exponent([10, 10], [1, 2]))
+
+    def test_growth_reports(self):
+        """Сверхлинейный рост памяти помечается, линейный - нет"""
+        results = {
+            "linear": [ScalingPoint("linear", n, n, n * 1e-6, n * 8) for n in (1000, 10000, 100000)],
+            "square": [ScalingPoint("square", n, n, n * 1e-6, n * n) for n in (1000, 10000, 100000)],
+        }
+        linear, square = growth_reports(results)
+        self.assertEqual(linear.superlinear, [])
+        self.assertEqual(square.superlinear, ["память"])
+        self.assertIn("СВЕРХЛИНЕЙНО", str(square))
+
+    def test_run_scaling(self):
+        """Замер в текущем и в отдельном процессе даёт память и блоки на элемент"""
+        for isolate in (False, True):
+            results = run_scaling({"list": make_list}, [20000], isolate=isolate)
+            point = results["list"][0]
+            self.assertEqual(point.items, 20000)
+            self.assertGreater(point.bytes_per_item, 8)
+            self.assertGreaterEqual(point.blocks_per_item, 0.9)
+            self.assertGreater(point.items_per_second, 0)
+
+
+class TestBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline = {
+            "results": [
+                {"name": "f", "n": 10, "min": 1.0},
+                {"name": "f", "n": 20, "min": 2.0},
+            ]
+        }
+
+    def test_load_and_compare(self):
+        """Замедление сверх порога попадает в отчёт, в пределах порога - нет"""
+        baseline = load_baseline(io.StringIO(json.dumps(self.baseline)))
+        results = {"f": [Measurement("f", 10, [1.05]), Measurement("f", 20, [3.0]),
+                         Measurement("f", 30, [100.0])]}
+        regressions = compare(results, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0].n, 20)
+        self.assertAlmostEqual(regressions[0].ratio, 1.5)
+
+    def test_roundtrip(self):
+        """Результаты, записанные write_json, читаются как базовая линия"""
+        results = {"f": [Measurement("f", 10, [1.0, 2.0])]}
+        out = io.StringIO()
+        write_json(results, out)
+        baseline = load_baseline(io.StringIO(out.getvalue()))
+        self.assertEqual(compare(results, baseline, threshold=0.0), [])
+
+    def test_missing_results_key(self):
+        """Проверка выброса KeyError для файла без ключа 'results'"""
+        with self.assertRaises(KeyError):
+            load_baseline(io.StringIO("{}"))
+
+
+
+def fast(n):
+    return n
+
+
+def slow(n):
+    time.sleep(0.01)
+    return n
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "baseline.json")
+
+    def run_cli(self, func, *options):
+        args = make_parser("test").parse_args(
+            ["--headless", "--no-memory", "--repeat", "3", "--warmup", "0", "--baseline", self.path, *options])
+        stream = io.StringIO()
+        code = run({"f": func}, [1, 2], args, title="test", stream=stream)
+        return code, stream.getvalue()
+
+    def test_creates_missing_baseline(self):
+        """Без файла базовая линия создаётся, код завершения 0"""
+        code, output = self.run_cli(fast)
+        self.assertEqual(code, 0)
+        self.assertIn("Базовая линия сохранена", output)
+        self.assertEqual(set(load_baseline(self.path)), {("f", 1), ("f", 2)})
+
+    def test_slowdown_returns_1(self):
+        """Замедление сверх порога даёт код 1, файл не меняется"""
+        self.run_cli(fast)
+        with open(self.path, encoding="utf-8") as f:
+            before = f.read()
+        code, output = self.run_cli(slow)
+        self.assertEqual(code, 1)
+        self.assertIn("ЗАМЕДЛЕНИЕ", output)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), before)
+
+    def test_update_baseline(self):
+        """--update-baseline перезаписывает файл новыми результатами"""
+        self.run_cli(fast)
+        code, _ = self.run_cli(slow, "--update-baseline")
+        self.assertEqual(code, 1)
+        self.assertGreaterEqual(load_baseline(self.path)[("f", 1)]["min"], 0.01)
+        code, output = self.run_cli(slow, "--threshold", "1.0")
+        self.assertEqual(code, 0)
+        self.assertIn("Замедлений относительно базовой линии нет", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from currenties import get_currencies
+
+# Архив курсов: страница daily_json.js за каждый день
+ARCHIVE_URL = "https://www.cbr-xml-daily.ru/archive/{date:%Y/%m/%d}/daily_json.js"
+
+
+def archive_url(date: datetime.date) -> str:
+    '''Адрес курсов ЦБ на дату date'''
+    return ARCHIVE_URL.format(date=date)
+
+
+def archive_urls(start: datetime.date, end: datetime.date) -> list:
+    '''Адреса курсов за каждый день от start до end включительно'''
+    days = (end - start).days
+    if days < 0:
+        raise ValueError("Начальная дата позже конечной")
+    return [archive_url(start + datetime.timedelta(days=i)) for i in range(days + 1)]
+
+
+# Потоки, в которых выполняются запросы; пул живёт всё время работы
+# программы, поэтому выход из get_currencies_many не ждёт потоков,
+# чьи запросы брошены по таймауту
+MAX_WORKERS = 32
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='currencies')
+
+# Запас таймаута HTTP-запроса над таймаутом ожидания: по истечении timeout
+# вызывающий получает TimeoutError, а поток освобождается вскоре после этого
+_HTTP_GRACE = 0.5
+
+
+async def get_currencies_async(currency_codes: list, url="https://www.cbr-xml-daily.ru/daily_json.js",
+                               timeout=10.0, executor=None) -> dict:
+    """
+    Асинхронный вариант get_currencies.
+
+    Запрос выполняется get_currencies в пуле потоков (общая сессия,
+    кэш ответов и те же проверки данных), поэтому результат и
+    исключения совпадают с синхронной версией. Если ответ не получен
+    за timeout секунд, выбрасывается TimeoutError. Сам HTTP-запрос
+    делается одной попыткой с таймаутом timeout + 0.5 с, так что
+    брошенный поток тоже завершается вовремя.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(get_currencies, currency_codes, url, timeout=timeout + _HTTP_GRACE)
+    return await asyncio.wait_for(loop.run_in_executor(executor or _EXECUTOR, call), timeout)
+
+
+async def get_currencies_many(currency_codes: list, urls, limit=10, timeout=10.0, return_exceptions=False) -> list:
+    """
+    Получает курсы currency_codes по каждому адресу из urls одновременно.
+
+    limit: сколько запросов выполняется одновременно (не больше MAX_WORKERS)
+    timeout: таймаут на один адрес, без учёта ожидания своей очереди
+    return_exceptions: вернуть исключение на месте неудачного адреса
+                       вместо того, чтобы выбросить первое из них
+
+    Возвращает список словарей {код: курс} в порядке urls.
+    """
+    if limit < 1:
+        raise ValueError("limit должен быть положительным")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def fetch(url):
+        async with semaphore:
+            return await get_currencies_async(currency_codes, url, timeout)
+
+    return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=return_exceptions)
+
+
+def backfill(currency_codes: list, start: datetime.date, end: datetime.date, limit=10, timeout=10.0) -> dict:
+    '''
+    Курсы за каждый день от start до end: {дата: {код: курс}}.
+    Дни, за которые получить курсы не удалось, пропускаются.
+    '''
+    urls = archive_urls(start, end)
+    results = asyncio.run(get_currencies_many(currency_codes, urls, limit, timeout, return_exceptions=True))
+    return {start + datetime.timedelta(days=i): rates
+            for i, rates in enumerate(results) if not isinstance(rates, BaseException)}
+
+
+if __name__ == "__main__":
+    today = datetime.date.today()
+    rates = backfill(['USD', 'EUR'], today - datetime.timedelta(days=30), today)
+    for date, values in sorted(rates.items()):
+        print(date, values)
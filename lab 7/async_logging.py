@@ -0,0 +1,195 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+# Что делать, если очередь заполнена
+POLICIES = ('block', 'drop_new', 'drop_oldest')
+
+
+def _check_policy(policy):
+    if policy not in POLICIES:
+        raise ValueError(f"Неизвестная политика {policy!r}, доступны: {', '.join(POLICIES)}")
+
+
+def _put(q, item, policy, timeout):
+    '''
+    Кладёт item в ограниченную очередь по политике policy.
+
+    block: ждать освобождения места не дольше timeout (None - без ограничения),
+           затем отбросить запись
+    drop_new: сразу отбросить новую запись
+    drop_oldest: вытеснить самую старую запись
+    Возвращает True, если запись попала в очередь.
+    '''
+    if policy == 'block':
+        try:
+            q.put(item, timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+    while True:
+        try:
+            q.put_nowait(item)
+            return True
+        except queue.Full:
+            if policy == 'drop_new':
+                return False
+        try:
+            q.get_nowait()
+            q.task_done()
+        except queue.Empty:
+            pass
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler для ограниченной очереди с политикой переполнения.
+
+    Запись форматируется в вызывающем потоке (как в QueueHandler),
+    а ввод-вывод выполняет QueueListener в фоновом потоке.
+    dropped - число отброшенных записей.
+    """
+
+    def __init__(self, q, policy='drop_new', timeout=None):
+        _check_policy(policy)
+        super().__init__(q)
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+
+    def enqueue(self, record):
+        if not _put(self.queue, record, self.policy, self.timeout):
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    """QueueListener, который дожидается места под сигнал остановки"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging:
+    """
+    Асинхронный вывод для logging.Logger.
+
+    Обработчики логгера переносятся в фоновый QueueListener, а сам логгер
+    получает BoundedQueueHandler, так что вызов handle.info() только
+    кладёт запись в очередь. stop() дописывает оставшиеся записи;
+    он же вызывается при выходе из программы.
+    """
+
+    def __init__(self, log: logging.Logger, capacity=10000, policy='drop_new', timeout=None):
+        if capacity < 1:
+            raise ValueError("capacity должен быть положительным")
+        self.log = log
+        self.handlers = list(log.handlers)
+        self.queue = queue.Queue(capacity)
+        self.handler = BoundedQueueHandler(self.queue, policy, timeout)
+        self.listener = _Listener(self.queue, *self.handlers, respect_handler_level=True)
+        for handler in self.handlers:
+            log.removeHandler(handler)
+        log.addHandler(self.handler)
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def stop(self):
+        '''Дописывает очередь, останавливает поток и возвращает логгеру его обработчики'''
+        if not self.running:
+            return
+        self.running = False
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.flush()
+        self.log.removeHandler(self.handler)
+        for handler in self.handlers:
+            self.log.addHandler(handler)
+        atexit.unregister(self.stop)
+
+
+def async_logging(log: logging.Logger, capacity=10000, policy='drop_new', timeout=None) -> AsyncLogging:
+    '''
+    Переводит логгер на асинхронный вывод через очередь
+    capacity: размер очереди
+    policy: 'block', 'drop_new' или 'drop_oldest' (см. _put)
+    timeout: для 'block' - сколько ждать места в очереди
+    '''
+    return AsyncLogging(log, capacity, policy, timeout)
+
+
+class AsyncStream:
+    """
+    Поток с методом write, который пишет в stream в фоновом потоке.
+
+    Подходит как handle для декоратора logger вместо sys.stdout или файла:
+    write() только кладёт строку в ограниченную очередь. flush() ждёт,
+    пока очередь будет записана; close() (и выход из программы)
+    дописывает её и останавливает поток.
+    """
+
+    _STOP = object()
+
+    def __init__(self, stream=sys.stdout, capacity=10000, policy='drop_new', timeout=None):
+        _check_policy(policy)
+        if capacity < 1:
+            raise ValueError("capacity должен быть положительным")
+        self.stream = stream
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+        self.queue = queue.Queue(capacity)
+        self._thread = threading.Thread(target=self._run, name='AsyncStream', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            # забираем всё, что уже накопилось, и сбрасываем буфер один раз
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            try:
+                for text in batch:
+                    if text is self._STOP:
+                        stop = True
+                        break
+                    self.stream.write(text)
+                self.stream.flush()
+            except Exception:
+                pass  # ошибки вывода не должны останавливать поток
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def write(self, text: str):
+        if self._thread is None:
+            raise ValueError("Поток закрыт")
+        if not _put(self.queue, text, self.policy, self.timeout):
+            self.dropped += 1
+
+    def flush(self):
+        '''Ждёт, пока все записанные строки дойдут до stream'''
+        if self._thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+        atexit.unregister(self.close)
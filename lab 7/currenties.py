@@ -1,25 +1,28 @@
 import requests
 import json
-def get_currencies(currency_codes: list, url="https://www.cbr-xml-daily.ru/daily_json.js") -> dict:
+
+from http_cache import CURRENCY_CACHE
+
+
+def get_currencies(currency_codes: list, url="https://www.cbr-xml-daily.ru/daily_json.js", timeout=None) -> dict:
     """
     Получает курсы валют с API Центробанка России.
 
     Args:
         currency_codes (list): Список символьных кодов валют (например, ['USD', 'EUR']).
+        timeout (float): Таймаут запроса; если задан, запрос делается одной
+            попыткой без повторов и длится не дольше таймаута.
     """
     if not isinstance(currency_codes, list):
         raise TypeError("currency_codes должен быть списком")
 
+    # Ответ берётся из CURRENCY_CACHE: сервер запрашивается не чаще раза в ttl
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Проверка статуса HTTP (4xx, 5xx)
+        data = CURRENCY_CACHE.get(url, timeout=timeout)
     except (requests.ConnectionError, requests.Timeout):
         raise ConnectionError(f"API недоступен: {url}")
     except requests.HTTPError:
         raise ConnectionError(f"Ошибка HTTP при доступе к {url}")
-
-    try:
-        data = response.json()
     except json.JSONDecodeError:
         raise ValueError("Получен некорректный JSON")
 
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from http_session import get_session
+from single_flight import SingleFlight
+
+
+class CacheEntry:
+    """Разобранный ответ и данные для условного запроса"""
+
+    __slots__ = ('data', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, data, etag, last_modified, fetched_at):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class ResponseCache:
+    """
+    Кэш разобранных HTTP-ответов по URL.
+
+    ttl: сколько секунд ответ считается свежим и отдаётся без запроса
+    stale_while_revalidate: сколько секунд после ttl устаревший ответ ещё
+        отдаётся сразу, а обновляется в фоновом потоке
+    stale_if_error: сколько секунд после ttl устаревший ответ отдаётся,
+        если обновить его не удалось
+    parse: функция, получающая из requests.Response данные для кэша
+    timeout: таймаут запроса (None - по умолчанию из http_session);
+             get(url, timeout=...) задаёт его для одного вызова, и тогда
+             запрос делается одной попыткой, без повторов
+    max_entries: сколько url хранить; сверх этого вытесняется ответ,
+                 к которому дольше всех не обращались (None - без ограничения)
+
+    Обновление - условный запрос с If-None-Match / If-Modified-Since:
+    на ответ 304 данные остаются прежними, а срок свежести продлевается.
+    Ошибки запроса и разбора пробрасываются без изменений, если
+    подходящего устаревшего ответа нет. Одновременные запросы одного
+    url объединяются (SingleFlight): сервер получает один запрос,
+    а ждущие потоки - его результат или его ошибку. Поток с таймаутом
+    ждёт чужой запрос не дольше этого таймаута, иначе - requests.Timeout.
+    """
+
+    def __init__(self, ttl=3600.0, stale_while_revalidate=0.0, stale_if_error=86400.0,
+                 parse=lambda response: response.json(), timeout=None, max_entries=256,
+                 clock=time.monotonic):
+        if ttl < 0 or stale_while_revalidate < 0 or stale_if_error < 0:
+            raise ValueError("Сроки кэша не могут быть отрицательными")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries должен быть не меньше 1")
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.parse = parse
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # от давно использованных к недавним
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    def _fetch(self, url, entry, timeout=None):
+        '''Запрашивает url (условно, если есть entry) и сохраняет результат'''
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        if timeout is None:
+            response = get_session().get(url, headers=headers, timeout=self.timeout)
+        else:
+            response = get_session(retries=False).get(url, headers=headers, timeout=timeout)
+        now = self.clock()
+        if entry is not None and response.status_code == 304:
+            fresh = CacheEntry(entry.data, response.headers.get('ETag', entry.etag),
+                               response.headers.get('Last-Modified', entry.last_modified), now)
+        else:
+            response.raise_for_status()
+            fresh = CacheEntry(self.parse(response), response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'), now)
+        with self._lock:
+            self._entries[url] = fresh
+            self._entries.move_to_end(url)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return fresh
+
+    def _refresh_in_background(self, url, entry):
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def run():
+            try:
+                self._fetch(url, entry)
+            except (requests.RequestException, ValueError):
+                pass  # останется устаревший ответ, следующий вызов попробует снова
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, name='CacheRefresh', daemon=True).start()
+
+    def _load(self, url, entry, timeout):
+        '''Запрос url через SingleFlight; ожидание чужого запроса ограничено timeout'''
+        # таймаут requests бывает парой (соединение, чтение)
+        wait = sum(timeout) if isinstance(timeout, tuple) else timeout
+        try:
+            return self._flight.do(url, self._fetch, url, entry, timeout, wait_timeout=wait)
+        except TimeoutError as e:
+            raise requests.Timeout(f"Запрос {url} не завершился за {wait} с") from e
+
+    def get(self, url: str, timeout=None):
+        '''Данные по url: из кэша, если они ещё годны, иначе с сервера'''
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+        if entry is None:
+            return self._load(url, None, timeout).data
+        age = self.clock() - entry.fetched_at
+        if age < self.ttl:
+            return entry.data
+        if age < self.ttl + self.stale_while_revalidate:
+            self._refresh_in_background(url, entry)
+            return entry.data
+        try:
+            return self._load(url, entry, timeout).data
+        except (requests.RequestException, ValueError):
+            if age < self.ttl + self.stale_if_error:
+                return entry.data
+            raise
+
+    def invalidate(self, url=None):
+        '''Удаляет ответ для url или весь кэш'''
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+
+
+# Общий кэш для get_currencies: курсы ЦБ меняются раз в сутки
+CURRENCY_CACHE = ResponseCache(ttl=3600.0, stale_while_revalidate=600.0)
@@ -0,0 +1,71 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Таймауты по умолчанию: (соединение, чтение), секунды
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с таймаутом по умолчанию (у requests его нет)"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+def make_adapter(timeout=DEFAULT_TIMEOUT, retries=3, backoff=0.3, pool_maxsize=16) -> TimeoutHTTPAdapter:
+    '''
+    Адаптер с пулом соединений и повторами
+    timeout: таймаут по умолчанию, число или пара (соединение, чтение)
+    retries: сколько раз повторять GET при ошибке соединения или
+             ответе 429/5xx
+    backoff: базовая пауза между повторами (растёт вдвое с каждым)
+    pool_maxsize: сколько соединений к одному хосту держать открытыми
+    '''
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,  # последний ответ отдаётся, raise_for_status решает сам
+    )
+    return TimeoutHTTPAdapter(timeout=timeout, max_retries=retry, pool_maxsize=pool_maxsize)
+
+
+def make_session(adapter=None) -> requests.Session:
+    '''Session с keep-alive, где http и https идут через adapter'''
+    session = requests.Session()
+    adapter = adapter or make_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Общий пул соединений: адаптер (а с ним и пул urllib3) один на процесс,
+# а Session у каждого потока своя, так что состояние сессии (cookies)
+# потоки не делят. Второй адаптер - без повторов, для запросов,
+# время которых ограничено одним таймаутом
+_ADAPTERS = {True: make_adapter(), False: make_adapter(retries=0)}
+_local = threading.local()
+
+
+def get_session(retries=True) -> requests.Session:
+    '''
+    Session текущего потока, использующая общий пул соединений.
+    retries=False - без повторов: запрос длится не дольше своего таймаута
+    '''
+    sessions = getattr(_local, 'sessions', None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+    session = sessions.get(retries)
+    if session is None:
+        session = sessions[retries] = make_session(_ADAPTERS[retries])
+    return session
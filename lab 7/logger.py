@@ -4,50 +4,129 @@ import functools
 import requests
 import json
 import math
+import time
 
+from async_logging import async_logging
+from metrics import METRICS, Metrics
+from sampling import LogSampler
+from http_cache import CURRENCY_CACHE
 
-def logger(func=None, *, handle=sys.stdout):
+
+class _LazyText:
+    """
+    Текстовое представление объекта, которое строится только при выводе.
+
+    logging подставляет аргументы в сообщение лишь тогда, когда запись
+    действительно пишется, поэтому repr больших результатов (например,
+    словаря курсов) не считается при выключенном уровне INFO.
+    Строка длиннее max_len обрезается.
+    """
+
+    __slots__ = ('obj', 'to_text', 'max_len')
+
+    def __init__(self, obj, to_text=repr, max_len=None):
+        self.obj = obj
+        self.to_text = to_text
+        self.max_len = max_len
+
+    def __str__(self):
+        text = self.to_text(self.obj)
+        if self.max_len is not None and len(text) > self.max_len:
+            return f"{text[:self.max_len]}... (+{len(text) - self.max_len} символов)"
+        return text
+
+
+def logger(func=None, *, handle=sys.stdout, max_repr=1000, metrics=None, sampler=None):
     """
     Параметризуемый декоратор для логирования выполнения функции.
+
+    handle: поток с методом write или logging.Logger
+            (для асинхронного вывода - AsyncStream или логгер
+            после async_logging, см. async_logging.py)
+    max_repr: предельная длина представления аргументов и результата
+              (None - без ограничения)
+    metrics: Metrics, куда записывается время каждого вызова
+             (perf_counter_ns, без учёта логирования); True - общий METRICS
+    sampler: LogSampler - логировать только часть успешных вызовов
+             (выборка 1 из N и ограничение частоты, см. sampling.py);
+             ошибки логируются всегда, вместе со строкой Started
+
+    Для logging.Logger сообщения передаются в %-стиле, а уровень
+    проверяется через isEnabledFor до вызова, поэтому при выключенном
+    INFO декоратор не форматирует ни аргументы, ни результат.
     """
     if func is None:
-        return lambda f: logger(f, handle=handle)
+        return lambda f: logger(f, handle=handle, max_repr=max_repr, metrics=metrics, sampler=sampler)
+
+    is_logging_obj = isinstance(handle, logging.Logger)
+    func_name = func.__name__
+    if metrics is True:
+        metrics = METRICS
+    stats = metrics.stats(func_name) if isinstance(metrics, Metrics) else None
+
+    def log_started(args, kwargs):
+        if is_logging_obj:
+            if handle.isEnabledFor(logging.INFO):
+                handle.info("INFO: Started '%s'. args: %s, kwargs: %s", func_name,
+                            _LazyText(args, max_len=max_repr), _LazyText(kwargs, max_len=max_repr))
+        else:
+            handle.write(f"INFO: Started '{func_name}'. args: {_LazyText(args, max_len=max_repr)}, "
+                         f"kwargs: {_LazyText(kwargs, max_len=max_repr)}\n")
+
+    def log_summary():
+        summary = sampler.pop_summary()
+        if summary is None:
+            return
+        count, seconds = summary
+        if is_logging_obj:
+            handle.info("Suppressed %d messages for '%s' in the last %.0f s", count, func_name, seconds)
+        else:
+            handle.write(f"INFO: Suppressed {count} messages for '{func_name}' in the last {seconds:.0f} s\n")
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        is_logging_obj = isinstance(handle, logging.Logger)
-        func_name = func.__name__
-        args_repr = f"args: {args}, kwargs: {kwargs}"
+        if sampler is None:
+            log_call = True
+        else:
+            log_call = sampler.should_log()
+            log_summary()
 
         # Логирование старта (INFO)
-        start_msg = f"INFO: Started '{func_name}'. {args_repr}"
-        if is_logging_obj:
-            handle.info(start_msg)
-        else:
-            handle.write(f"INFO: Started '{func_name}'. {args_repr}\n")
+        if log_call:
+            log_started(args, kwargs)
 
+        start = time.perf_counter_ns() if stats is not None else 0
         try:
             result = func(*args, **kwargs)
-
-            # Логирование успеха (INFO)
-            success_msg = f"Finished '{func_name}'. Result: {result}"
-            if is_logging_obj:
-                handle.info(success_msg)
-            else:
-                handle.write(f"INFO: Finished '{func_name}'. Result: {result}\n")
-
-            return result
-
         except Exception as e:
-            #  Логирование ошибки (ERROR)
-            error_msg = f"Failed '{func_name}'. Error: {type(e).__name__} - {e}"
+            if stats is not None:
+                stats.record(time.perf_counter_ns() - start, failed=True)
+            #  Логирование ошибки (ERROR), при выборке - вместе со стартом
+            if not log_call:
+                log_started(args, kwargs)
             if is_logging_obj:
-                handle.error(error_msg)
+                if handle.isEnabledFor(logging.ERROR):
+                    handle.error("Failed '%s'. Error: %s - %s", func_name, type(e).__name__,
+                                 _LazyText(e, str, max_repr))
             else:
-                handle.write(f"ERROR: Failed '{func_name}'. Error: {type(e).__name__} - {e}\n")
+                handle.write(f"ERROR: Failed '{func_name}'. Error: {type(e).__name__} - "
+                             f"{_LazyText(e, str, max_repr)}\n")
 
             # Повторный выброс исключения
-            raise e
+            raise
+        if stats is not None:
+            stats.record(time.perf_counter_ns() - start)
+
+        # Логирование успеха (INFO)
+        if not log_call:
+            sampler.suppress(2)
+        elif is_logging_obj:
+            if handle.isEnabledFor(logging.INFO):
+                handle.info("Finished '%s'. Result: %s", func_name, _LazyText(result, str, max_repr))
+        else:
+            handle.write(f"INFO: Finished '{func_name}'. Result: {_LazyText(result, str, max_repr)}\n")
+
+        return result
 
     return wrapper
 
@@ -57,14 +136,19 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 # Создаем и настраиваем логгер для файла
 file_logger = logging.getLogger("currency_file")
 file_logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler("currencies.log", mode='a')
+# без передачи корневому логгеру: его обработчик из basicConfig пишет в stderr синхронно
+file_logger.propagate = False
+file_handler = logging.FileHandler("currencies.log", mode='a', delay=True)
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(formatter)
 if not file_logger.handlers:  # Избегаем дублирования обработчиков при повторном запуске
     file_logger.addHandler(file_handler)
+    # запись в файл - в фоновом потоке, вызов get_currencies не ждёт диска
+    file_logging = async_logging(file_logger)
 
 
-@logger(handle=file_logger)
+# при высокой частоте вызовов успешные пишутся в файл не чаще 10 раз в секунду
+@logger(handle=file_logger, metrics=True, sampler=LogSampler(rate=10, burst=20))
 def get_currencies(currency_codes: list, url="https://www.cbr-xml-daily.ru/daily_json.js") -> dict:
     """
     Получает курсы валют с API Центробанка России.
@@ -79,16 +163,13 @@ def get_currencies(currency_codes: list, url="https://www.cbr-xml-daily.ru/daily
     if not isinstance(currency_codes, list):
         raise TypeError("currency_codes должен быть списком")
 
+    # Ответ берётся из CURRENCY_CACHE: сервер запрашивается не чаще раза в ttl
     try:
-        response = requests.get(url)
-        response.raise_for_status()
+        data = CURRENCY_CACHE.get(url)
     except (requests.ConnectionError, requests.Timeout):
         raise ConnectionError(f"API недоступен: {url}")
     except requests.HTTPError:
         raise ConnectionError(f"Ошибка HTTP при доступе к {url}")
-
-    try:
-        data = response.json()
     except json.JSONDecodeError:
         raise ValueError("Получен некорректный JSON")
 
@@ -118,7 +199,7 @@ quad_logger = logging.getLogger("QuadraticSolver")
 quad_logger.setLevel(logging.INFO)
 
 
-@logger(handle=quad_logger)
+@logger(handle=quad_logger, metrics=True)
 def solve_quadratic(a, b, c):
     """
     Решает квадратное уравнение, ошибки, перехватывает декоратором.
@@ -185,4 +266,7 @@ if __name__ == "__main__":
     try:
         solve_quadratic(0, 0, 5)
     except ValueError:
-        print("ValueError")
\ No newline at end of file
+        print("ValueError")
+
+    print("\nВремя вызовов:")
+    METRICS.dump()
@@ -0,0 +1,187 @@
+import sys
+import threading
+
+# Число корзин гистограммы на каждую степень двойки (погрешность ~ 1/SUB_BUCKETS)
+SUB_BUCKETS = 8
+_SUB_BITS = SUB_BUCKETS.bit_length() - 1
+
+
+def _bucket(ns: int) -> int:
+    '''
+    Номер корзины логарифмической гистограммы для длительности ns.
+    Значения меньше SUB_BUCKETS попадают в собственные корзины, дальше
+    каждая степень двойки делится на SUB_BUCKETS равных частей.
+    '''
+    if ns < SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - 1 - _SUB_BITS
+    return (shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    '''Верхняя граница корзины (включительно), нс'''
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+
+class FunctionStats:
+    """
+    Статистика вызовов одной функции.
+
+    count: число вызовов, errors: сколько из них закончились исключением,
+    total_ns/min_ns/max_ns: суммарное, наименьшее и наибольшее время.
+    Длительности хранятся в логарифмической гистограмме, поэтому память
+    не растёт с числом вызовов, а процентили получаются с точностью
+    до ширины корзины (около 12%).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.errors = 0
+            self.total_ns = 0
+            self.min_ns = None
+            self.max_ns = None
+            self.buckets = {}
+
+    def record(self, ns: int, failed=False):
+        with self._lock:
+            self.count += 1
+            if failed:
+                self.errors += 1
+            self.total_ns += ns
+            if self.min_ns is None or ns < self.min_ns:
+                self.min_ns = ns
+            if self.max_ns is None or ns > self.max_ns:
+                self.max_ns = ns
+            index = _bucket(ns)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def _percentiles(self, qs) -> list:
+        if not self.count:
+            return [None] * len(qs)
+        counts = sorted(self.buckets.items())
+        values = []
+        for q in qs:
+            rank = q / 100 * self.count
+            seen = 0
+            value = self.max_ns
+            for index, count in counts:
+                seen += count
+                if seen >= rank:
+                    value = min(_bucket_upper(index), self.max_ns)
+                    break
+            values.append(value)
+        return values
+
+    def percentile(self, q: float):
+        '''Оценка q-го процентиля (0 < q <= 100) в нс, None без вызовов'''
+        with self._lock:
+            return self._percentiles([q])[0]
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            p50, p95, p99 = self._percentiles([50, 95, 99])
+            return {
+                'name': self.name,
+                'count': self.count,
+                'errors': self.errors,
+                'mean_ns': self.total_ns / self.count if self.count else None,
+                'min_ns': self.min_ns,
+                'p50_ns': p50,
+                'p95_ns': p95,
+                'p99_ns': p99,
+                'max_ns': self.max_ns,
+            }
+
+    def __str__(self):
+        def ms(ns):
+            return '-' if ns is None else f"{ns / 1e6:.3f} мс"
+        row = self.as_dict()
+        return (f"{self.name}: вызовов {row['count']}, ошибок {row['errors']}, "
+                f"p50 {ms(row['p50_ns'])}, p95 {ms(row['p95_ns'])}, "
+                f"p99 {ms(row['p99_ns'])}, max {ms(row['max_ns'])}")
+
+
+class Metrics:
+    """
+    Набор FunctionStats по именам функций.
+
+    Декоратор logger с параметром metrics записывает сюда время каждого
+    вызова. dump() выводит сводку по запросу, start_periodic_dump() -
+    раз в interval секунд в фоновом потоке.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._dumper = None
+
+    def stats(self, name: str) -> FunctionStats:
+        '''Статистика функции name (создаётся при первом обращении)'''
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, FunctionStats(name))
+        return stats
+
+    def snapshot(self) -> dict:
+        '''Словарь {имя функции: FunctionStats.as_dict()}'''
+        with self._lock:
+            items = list(self._stats.items())
+        return {name: stats.as_dict() for name, stats in items}
+
+    def report(self) -> str:
+        with self._lock:
+            items = sorted(self._stats.items())
+        return '\n'.join(str(stats) for _, stats in items if stats.count)
+
+    def dump(self, handle=sys.stdout):
+        '''Выводит сводку в поток или logging.Logger'''
+        text = self.report()
+        if not text:
+            return
+        if hasattr(handle, 'info'):
+            handle.info("Metrics:\n%s", text)
+        else:
+            handle.write(text + '\n')
+
+    def reset(self):
+        '''Обнуляет статистику (декорированные функции продолжают писать в неё)'''
+        with self._lock:
+            items = list(self._stats.values())
+        for stats in items:
+            stats.reset()
+
+    def start_periodic_dump(self, interval: float, handle=sys.stdout):
+        '''Запускает вывод сводки каждые interval секунд'''
+        if interval <= 0:
+            raise ValueError("interval должен быть положительным")
+        self.stop_periodic_dump()
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.dump(handle)
+
+        thread = threading.Thread(target=run, name='MetricsDump', daemon=True)
+        self._dumper = (thread, stop)
+        thread.start()
+
+    def stop_periodic_dump(self):
+        if self._dumper is not None:
+            thread, stop = self._dumper
+            stop.set()
+            thread.join()
+            self._dumper = None
+
+
+# Общий набор метрик для logger(metrics=True)
+METRICS = Metrics()
@@ -0,0 +1,86 @@
+import itertools
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты: не больше rate событий в секунду
+    с допустимым всплеском до burst событий подряд.
+    """
+
+    def __init__(self, rate: float, burst=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate должен быть положительным")
+        self.rate = rate
+        self.burst = max(1.0, rate) if burst is None else burst
+        if self.burst < 1:
+            raise ValueError("burst должен быть не меньше 1")
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        '''Забирает один токен; False, если лимит исчерпан'''
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class LogSampler:
+    """
+    Решает, какие успешные вызовы логировать.
+
+    every: логировать каждый every-й вызов (1 - все)
+    rate, burst: не больше rate залогированных вызовов в секунду (TokenBucket)
+    summary_interval: не чаще чем раз в столько секунд сообщать,
+                      сколько сообщений было подавлено
+
+    Один экземпляр относится к одной функции:
+    @logger(handle=..., sampler=LogSampler(every=100)).
+    Ошибки логируются всегда, независимо от выборки и лимита.
+    """
+
+    def __init__(self, every=1, rate=None, burst=None, summary_interval=60.0, clock=time.monotonic):
+        if type(every) != int or every < 1:
+            raise ValueError("every должен быть положительным целым числом")
+        self.every = every
+        self.bucket = TokenBucket(rate, burst, clock) if rate is not None else None
+        self.summary_interval = summary_interval
+        self.clock = clock
+        self._calls = itertools.count()
+        self._suppressed = 0
+        self._since = clock()
+        self._lock = threading.Lock()
+
+    def should_log(self) -> bool:
+        '''Нужно ли логировать очередной вызов'''
+        if next(self._calls) % self.every:
+            return False
+        return self.bucket is None or self.bucket.take()
+
+    def suppress(self, messages=1):
+        '''Учитывает подавленные сообщения'''
+        with self._lock:
+            self._suppressed += messages
+
+    def pop_summary(self):
+        '''
+        Если с прошлой сводки прошло summary_interval секунд и были
+        подавленные сообщения - возвращает (число сообщений, секунды)
+        и начинает новый период, иначе None.
+        '''
+        with self._lock:
+            now = self.clock()
+            if now - self._since < self.summary_interval or not self._suppressed:
+                return None
+            count, seconds = self._suppressed, now - self._since
+            self._suppressed = 0
+            self._since = now
+        return count, seconds
@@ -0,0 +1,82 @@
+import copy
+import threading
+
+
+class _Call:
+    """Выполняющийся вызов: его результат или исключение и событие завершения"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def _own_error(error):
+    """
+    Копия исключения для ожидающего потока: raise добавляет кадры потока
+    в __traceback__, поэтому общий объект у нескольких потоков даёт
+    перемешанную трассировку. Исходное исключение - в __cause__.
+    """
+    try:
+        own = copy.copy(error)
+    except Exception:
+        return error
+    own.__traceback__ = None
+    own.__cause__ = error
+    return own
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вызовов с одним ключом.
+
+    Первый поток, вызвавший do(key, func), выполняет func, остальные
+    с тем же ключом ждут его и получают тот же результат или копию
+    того же исключения (исходное - в __cause__). Следующий вызов после
+    завершения снова выполняет func.
+
+    wait_timeout: сколько секунд ожидающий поток ждёт первого (None - без
+    ограничения); не дождавшись, он получает TimeoutError, а вызов первого
+    потока продолжается.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, wait_timeout=None, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        if not leader:
+            if not call.done.wait(wait_timeout):
+                with self._lock:
+                    call.waiters -= 1
+                raise TimeoutError(f"вызов {key!r} не завершился за {wait_timeout} с")
+            if call.error is not None:
+                raise _own_error(call.error)
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key) -> int:
+        '''Сколько потоков ждут вызова с ключом key (0 - вызова нет)'''
+        with self._lock:
+            call = self._calls.get(key)
+            return 0 if call is None else call.waiters + 1
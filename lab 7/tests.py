@@ -7,6 +7,22 @@ import requests
 import sys
 import functools
 
+import logger as logger_module
+from async_logging import AsyncStream, async_logging, _put
+import queue
+import threading
+from metrics import Metrics, FunctionStats, _bucket, _bucket_upper
+from sampling import LogSampler, TokenBucket
+from http_cache import ResponseCache, CURRENCY_CACHE
+import http_session
+import asyncio
+import datetime
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from async_currencies import archive_urls, get_currencies_async, get_currencies_many
+from single_flight import SingleFlight
+import currenties
+
 
 def logger(func=None, *, handle=sys.stdout):
     if func is None:
@@ -226,5 +242,729 @@ class TestLoggerDecorator(unittest.TestCase):
         self.assertFalse(mock_logger.error.called)
 
 
+class ListHandler(logging.Handler):
+    """Обработчик, собирающий отформатированные сообщения в список"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLazyLogger(unittest.TestCase):
+    """Тесты декоратора logger из logger.py"""
+
+    def setUp(self):
+        self.log = logging.getLogger(f"test_lazy.{self._testMethodName}")
+        self.log.propagate = False
+        self.handler = ListHandler()
+        self.log.addHandler(self.handler)
+
+    def tearDown(self):
+        self.log.removeHandler(self.handler)
+
+    def test_no_formatting_when_disabled(self):
+        """При выключенном INFO аргументы и результат не форматируются"""
+        formatted = []
+
+        class Expensive:
+            def __repr__(self):
+                formatted.append(1)
+                return "Expensive()"
+            __str__ = __repr__
+
+        self.log.setLevel(logging.WARNING)
+
+        @logger_module.logger(handle=self.log)
+        def work(x):
+            return Expensive()
+
+        work(Expensive())
+        self.assertEqual(formatted, [])
+        self.assertEqual(self.handler.messages, [])
+
+    def test_messages_when_enabled(self):
+        """При включённом INFO сообщения те же, что и раньше"""
+        self.log.setLevel(logging.INFO)
+
+        @logger_module.logger(handle=self.log)
+        def fail(x):
+            raise ValueError("bad")
+
+        @logger_module.logger(handle=self.log)
+        def ok(x, y=1):
+            return x + y
+
+        ok(2, y=3)
+        with self.assertRaises(ValueError):
+            fail(1)
+        self.assertEqual(self.handler.messages, [
+            "INFO: Started 'ok'. args: (2,), kwargs: {'y': 3}",
+            "Finished 'ok'. Result: 5",
+            "INFO: Started 'fail'. args: (1,), kwargs: {}",
+            "Failed 'fail'. Error: ValueError - bad",
+        ])
+
+    def test_truncation(self):
+        """Длинные представления обрезаются до max_repr"""
+        stream = io.StringIO()
+
+        @logger_module.logger(handle=stream, max_repr=20)
+        def big():
+            return {str(i): i for i in range(1000)}
+
+        big()
+        finished = stream.getvalue().splitlines()[1]
+        self.assertTrue(finished.startswith("INFO: Finished 'big'. Result: {'0': 0, '1': 1, '2'..."))
+        self.assertLess(len(finished), 100)
+
+
+class BlockingStream(io.StringIO):
+    """Поток, запись в который ждёт разрешения (медленный диск)"""
+
+    def __init__(self):
+        super().__init__()
+        self.allowed = threading.Event()
+
+    def write(self, text):
+        self.allowed.wait(5)
+        return super().write(text)
+
+
+class TestAsyncLogging(unittest.TestCase):
+    """Тесты асинхронного вывода"""
+
+    def test_stream_does_not_block(self):
+        """Декоратор не ждёт записи в поток, flush дописывает всё"""
+        target = BlockingStream()
+        stream = AsyncStream(target)
+
+        @logger_module.logger(handle=stream)
+        def add(x, y):
+            return x + y
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(target.getvalue(), "")
+        target.allowed.set()
+        stream.close()
+        self.assertEqual(target.getvalue(),
+                         "INFO: Started 'add'. args: (1, 2), kwargs: {}\nINFO: Finished 'add'. Result: 3\n")
+
+    def test_policies(self):
+        """Политики переполнения очереди"""
+        q = queue.Queue(2)
+        self.assertTrue(_put(q, 1, 'drop_new', None))
+        self.assertTrue(_put(q, 2, 'drop_new', None))
+        self.assertFalse(_put(q, 3, 'drop_new', None))
+        self.assertTrue(_put(q, 4, 'drop_oldest', None))
+        self.assertFalse(_put(q, 5, 'block', 0.01))
+        self.assertEqual([q.get_nowait(), q.get_nowait()], [2, 4])
+        with self.assertRaises(ValueError):
+            AsyncStream(io.StringIO(), policy='wait')
+
+    def test_stream_drops_when_full(self):
+        """Переполнение считается в dropped, а не останавливает вызов"""
+        target = BlockingStream()
+        stream = AsyncStream(target, capacity=1)
+        for i in range(20):
+            stream.write(f"{i}\n")
+        self.assertGreater(stream.dropped, 0)
+        target.allowed.set()
+        stream.close()
+        self.assertEqual(len(target.getvalue().splitlines()), 20 - stream.dropped)
+        with self.assertRaises(ValueError):
+            stream.write("closed\n")
+
+    def test_logger_flushed_on_stop(self):
+        """Записи логгера дописываются при остановке, обработчики возвращаются"""
+        log = logging.getLogger("test_async_logging")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        handler = ListHandler()
+        log.addHandler(handler)
+        backend = async_logging(log, capacity=100)
+        try:
+            @logger_module.logger(handle=log)
+            def ok(x):
+                return x
+
+            for i in range(10):
+                ok(i)
+        finally:
+            backend.stop()
+            log.removeHandler(handler)
+        self.assertEqual(len(handler.messages), 20)
+        self.assertEqual(handler.messages[-1], "Finished 'ok'. Result: 9")
+        self.assertEqual(log.handlers, [])
+        self.assertEqual(backend.dropped, 0)
+
+    def test_file_logger_not_blocked(self):
+        """Вызов с file_logger не ждёт ни одного обработчика, в том числе корневых"""
+        target = BlockingStream()
+        handler = logging.StreamHandler(target)
+        root = logging.getLogger()
+        root.addHandler(handler)
+        try:
+            @logger_module.logger(handle=logger_module.file_logger)
+            def add(x, y):
+                return x + y
+
+            start = time.monotonic()
+            self.assertEqual(add(1, 2), 3)
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            target.allowed.set()
+            root.removeHandler(handler)
+        self.assertFalse(logger_module.file_logger.propagate)
+        self.assertEqual(target.getvalue(), "")
+
+
+class TestMetrics(unittest.TestCase):
+    """Тесты режима замера времени"""
+
+    def test_buckets(self):
+        """Каждое значение попадает в корзину, граница которой не меньше его"""
+        for ns in list(range(2000)) + [10 ** 6, 10 ** 9 + 7, 2 ** 40 - 1]:
+            index = _bucket(ns)
+            self.assertLessEqual(ns, _bucket_upper(index))
+            if index:
+                self.assertGreater(ns, _bucket_upper(index - 1))
+
+    def test_percentiles(self):
+        """Процентили в пределах ширины корзины"""
+        stats = FunctionStats("f")
+        self.assertIsNone(stats.percentile(50))
+        for i in range(1, 1001):
+            stats.record(i * 1000, failed=i % 10 == 0)
+        row = stats.as_dict()
+        self.assertEqual(row["count"], 1000)
+        self.assertEqual(row["errors"], 100)
+        self.assertEqual(row["max_ns"], 1000000)
+        for key, exact in (("p50_ns", 500000), ("p95_ns", 950000), ("p99_ns", 990000)):
+            self.assertGreaterEqual(row[key], exact)
+            self.assertLessEqual(row[key], exact * 1.13)
+
+    def test_decorator_records_calls(self):
+        """Декоратор считает вызовы и ошибки, reset обнуляет их"""
+        metrics = Metrics()
+
+        @logger_module.logger(handle=io.StringIO(), metrics=metrics)
+        def inverse(x):
+            return 1 / x
+
+        inverse(2)
+        inverse(4)
+        with self.assertRaises(ZeroDivisionError):
+            inverse(0)
+        row = metrics.snapshot()["inverse"]
+        self.assertEqual((row["count"], row["errors"]), (3, 1))
+        self.assertGreater(row["p99_ns"], 0)
+
+        out = io.StringIO()
+        metrics.dump(out)
+        self.assertTrue(out.getvalue().startswith("inverse: вызовов 3, ошибок 1"))
+
+        metrics.reset()
+        inverse(1)
+        self.assertEqual(metrics.snapshot()["inverse"]["count"], 1)
+
+    def test_periodic_dump(self):
+        """Периодический вывод сводки"""
+        metrics = Metrics()
+        metrics.stats("f").record(1000)
+        out = io.StringIO()
+        metrics.start_periodic_dump(0.01, out)
+        try:
+            for _ in range(200):
+                if out.getvalue():
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            metrics.stop_periodic_dump()
+        self.assertIn("f: вызовов 1", out.getvalue())
+        with self.assertRaises(ValueError):
+            metrics.start_periodic_dump(0)
+
+
+class FakeClock:
+    """Управляемые часы для выборки и ограничения частоты"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSampling(unittest.TestCase):
+    """Тесты выборки и ограничения частоты логирования"""
+
+    def test_token_bucket(self):
+        """Не больше burst подряд, затем rate в секунду"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        self.assertEqual([bucket.take() for _ in range(4)], [True, True, True, False])
+        clock.now = 0.5
+        self.assertEqual([bucket.take(), bucket.take()], [True, False])
+        clock.now = 100
+        self.assertEqual(sum(bucket.take() for _ in range(10)), 3)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_every_nth_and_failures(self):
+        """Логируется 1 из N успешных вызовов и каждая ошибка"""
+        stream = io.StringIO()
+
+        @logger_module.logger(handle=stream, sampler=LogSampler(every=10))
+        def check(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x
+
+        for i in range(100):
+            check(i)
+        with self.assertRaises(ValueError):
+            check(-1)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(sum(line.startswith("INFO: Finished") for line in lines), 10)
+        self.assertEqual(lines[-2:], ["INFO: Started 'check'. args: (-1,), kwargs: {}",
+                                      "ERROR: Failed 'check'. Error: ValueError - negative"])
+
+    def test_rate_limit_and_summary(self):
+        """Сверх лимита сообщения подавляются, о них сообщает сводка"""
+        clock = FakeClock()
+        log = logging.getLogger("test_sampling")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        handler = ListHandler()
+        log.addHandler(handler)
+        sampler = LogSampler(rate=1, burst=2, summary_interval=10, clock=clock)
+        try:
+            @logger_module.logger(handle=log, sampler=sampler)
+            def ok():
+                return 1
+
+            for _ in range(5):
+                ok()
+            self.assertEqual(len(handler.messages), 4)
+            clock.now = 10
+            ok()
+        finally:
+            log.removeHandler(handler)
+        self.assertEqual(handler.messages[4], "Suppressed 6 messages for 'ok' in the last 10 s")
+        self.assertEqual(handler.messages[5:], ["INFO: Started 'ok'. args: (), kwargs: {}", "Finished 'ok'. Result: 1"])
+        with self.assertRaises(ValueError):
+            LogSampler(every=0)
+
+    def test_summary_once_per_interval(self):
+        """Сводку получает только один из одновременно проверяющих потоков"""
+        clock = FakeClock()
+        sampler = LogSampler(summary_interval=10, clock=clock)
+        sampler.suppress(3)
+        clock.now = 10
+        barrier = threading.Barrier(8)
+        summaries = []
+
+        def worker():
+            barrier.wait()
+            summaries.append(sampler.pop_summary())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([s for s in summaries if s is not None], [(3, 10)])
+
+
+def make_response(status=200, data=None, headers=None):
+    """Поддельный requests.Response"""
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = data
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status} Error")
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    """Тесты кэша ответов"""
+
+    URL = "http://example.test/daily.json"
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("http_cache.get_session")
+        self.get = patcher.start().return_value.get
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_hit(self):
+        """В пределах ttl сервер не запрашивается"""
+        cache = ResponseCache(ttl=60, clock=self.clock)
+        self.get.return_value = make_response(data={"a": 1})
+        self.assertEqual(cache.get(self.URL), {"a": 1})
+        self.clock.now = 59
+        self.assertEqual(cache.get(self.URL), {"a": 1})
+        self.assertEqual(self.get.call_count, 1)
+
+    def test_conditional_revalidation(self):
+        """После ttl - условный запрос; 304 продлевает старый ответ"""
+        cache = ResponseCache(ttl=60, clock=self.clock)
+        self.get.return_value = make_response(
+            data={"a": 1}, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        cache.get(self.URL)
+        self.clock.now = 61
+        self.get.return_value = make_response(status=304)
+        self.assertEqual(cache.get(self.URL), {"a": 1})
+        headers = self.get.call_args.kwargs["headers"]
+        self.assertEqual(headers, {"If-None-Match": '"v1"',
+                                   "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        self.clock.now = 120
+        cache.get(self.URL)
+        self.assertEqual(self.get.call_count, 2)
+
+    def test_stale_if_error(self):
+        """При ошибке обновления отдаётся устаревший ответ, пока он годен"""
+        cache = ResponseCache(ttl=60, stale_if_error=100, clock=self.clock)
+        self.get.return_value = make_response(data={"a": 1})
+        cache.get(self.URL)
+        self.get.side_effect = requests.ConnectionError("down")
+        self.clock.now = 150
+        self.assertEqual(cache.get(self.URL), {"a": 1})
+        self.clock.now = 170
+        with self.assertRaises(requests.ConnectionError):
+            cache.get(self.URL)
+
+    def test_max_entries(self):
+        """Сверх max_entries вытесняется давно не использованный url"""
+        cache = ResponseCache(ttl=60, max_entries=2, clock=self.clock)
+        self.get.side_effect = lambda url, **kwargs: make_response(data=url)
+        cache.get("http://a.test/")
+        cache.get("http://b.test/")
+        cache.get("http://a.test/")
+        cache.get("http://c.test/")
+        self.assertEqual(list(cache._entries), ["http://a.test/", "http://c.test/"])
+        self.assertEqual(self.get.call_count, 3)
+        self.assertEqual(cache.get("http://b.test/"), "http://b.test/")
+        self.assertEqual(self.get.call_count, 4)
+        self.assertEqual(list(cache._entries), ["http://c.test/", "http://b.test/"])
+        with self.assertRaises(ValueError):
+            ResponseCache(max_entries=0)
+
+    def test_stale_while_revalidate(self):
+        """Устаревший ответ отдаётся сразу, обновление идёт в фоне"""
+        cache = ResponseCache(ttl=60, stale_while_revalidate=60, clock=self.clock)
+        self.get.return_value = make_response(data={"a": 1})
+        cache.get(self.URL)
+        self.clock.now = 90
+        self.get.return_value = make_response(data={"a": 2})
+        self.assertEqual(cache.get(self.URL), {"a": 1})
+        for _ in range(200):
+            if cache.get(self.URL) == {"a": 2}:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(cache.get(self.URL), {"a": 2})
+        self.assertEqual(self.get.call_count, 2)
+
+    def test_get_currencies_uses_cache(self):
+        """Повторные вызовы get_currencies не обращаются к серверу"""
+        CURRENCY_CACHE.invalidate()
+        self.addCleanup(CURRENCY_CACHE.invalidate)
+        self.get.return_value = make_response(
+            data={"Valute": {"USD": {"Value": 90.0}, "EUR": {"Value": 100.0}}})
+        self.assertEqual(currenties.get_currencies(["USD"]), {"USD": 90.0})
+        self.assertEqual(currenties.get_currencies(["EUR"]), {"EUR": 100.0})
+        self.assertEqual(self.get.call_count, 1)
+
+        self.get.return_value = make_response(status=500)
+        with self.assertRaises(ConnectionError):
+            currenties.get_currencies(["USD"], url="http://example.test/broken")
+
+
+class TestHttpSession(unittest.TestCase):
+    """Тесты общей сессии"""
+
+    def test_session_per_thread_shared_pool(self):
+        """У каждого потока своя Session с общим адаптером"""
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(http_session.get_session()))
+        thread.start()
+        thread.join()
+        own = http_session.get_session()
+        self.assertIs(own, http_session.get_session())
+        self.assertIsNot(own, sessions[0])
+        self.assertIs(own.get_adapter("https://example.test"), sessions[0].get_adapter("http://example.test"))
+
+    def test_adapter_settings(self):
+        """Повторы и таймаут по умолчанию"""
+        adapter = http_session.make_adapter(timeout=2, retries=5)
+        self.assertEqual(adapter.timeout, 2)
+        self.assertEqual(adapter.max_retries.total, 5)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+    def test_default_timeout_applied(self):
+        """Без явного таймаута запрос получает таймаут адаптера"""
+        adapter = http_session.make_adapter(timeout=(1, 2))
+        request = requests.Request("GET", "http://example.test/").prepare()
+        with patch.object(http_session.HTTPAdapter, "send", return_value="ok") as send:
+            self.assertEqual(adapter.send(request), "ok")
+            self.assertEqual(send.call_args.kwargs["timeout"], (1, 2))
+            adapter.send(request, timeout=7)
+            self.assertEqual(send.call_args.kwargs["timeout"], 7)
+
+
+class RatesHandler(BaseHTTPRequestHandler):
+    """Локальная замена сервера ЦБ: /<курс USD>.json, /missing - 404, /hang/... - зависает"""
+
+    delay = 0.2
+    hang = 2.0
+
+    def do_GET(self):
+        time.sleep(self.hang if self.path.startswith("/hang") else self.delay)
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        rate = float(self.path.strip("/").split("/")[-1].split(".")[0])
+        body = json.dumps({"Valute": {"USD": {"Value": rate}}}).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # клиент уже ушёл по таймауту
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncCurrencies(unittest.TestCase):
+    """Тесты асинхронного получения курсов"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RatesHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        CURRENCY_CACHE.invalidate()
+        self.addCleanup(CURRENCY_CACHE.invalidate)
+
+    def test_single(self):
+        """Результат совпадает с синхронной версией"""
+        rates = asyncio.run(get_currencies_async(["USD"], f"{self.base}/90.json"))
+        self.assertEqual(rates, {"USD": 90.0})
+
+    def test_many_concurrently(self):
+        """Адреса запрашиваются одновременно, порядок сохраняется"""
+        urls = [f"{self.base}/{rate}.json" for rate in range(80, 88)]
+        start = time.perf_counter()
+        results = asyncio.run(get_currencies_many(["USD"], urls, limit=8))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, [{"USD": float(rate)} for rate in range(80, 88)])
+        self.assertLess(elapsed, 8 * RatesHandler.delay / 2)
+
+    def test_errors(self):
+        """Ошибки те же, что у get_currencies; return_exceptions оставляет остальные результаты"""
+        urls = [f"{self.base}/90.json", f"{self.base}/missing"]
+        with self.assertRaises(ConnectionError):
+            asyncio.run(get_currencies_many(["USD"], urls))
+        results = asyncio.run(get_currencies_many(["USD", "EUR"], urls, return_exceptions=True))
+        self.assertIsInstance(results[0], KeyError)
+        self.assertIsInstance(results[1], ConnectionError)
+        with self.assertRaises(ValueError):
+            asyncio.run(get_currencies_many(["USD"], urls, limit=0))
+
+    def test_timeout(self):
+        """Медленный ответ прерывается по таймауту"""
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(get_currencies_async(["USD"], f"{self.base}/91.json", timeout=0.05))
+
+    def test_hanging_url_bounded(self):
+        """Зависший адрес не задерживает вызов и не блокирует цикл событий"""
+        timeout = 0.3
+        urls = [f"{self.base}/90.json", f"{self.base}/hang/91.json"]
+
+        async def main():
+            lags = []
+            done = asyncio.Event()
+
+            async def ticker():
+                while not done.is_set():
+                    before = time.perf_counter()
+                    await asyncio.sleep(0.01)
+                    lags.append(time.perf_counter() - before - 0.01)
+
+            tick = asyncio.create_task(ticker())
+            try:
+                results = await get_currencies_many(["USD"], urls, timeout=timeout, return_exceptions=True)
+            finally:
+                done.set()
+                await tick
+            return results, max(lags)
+
+        start = time.perf_counter()
+        results, max_lag = asyncio.run(main())
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results[0], {"USD": 90.0})
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertLess(elapsed, RatesHandler.hang / 2)
+        self.assertLess(max_lag, 0.1)
+
+    def test_http_timeout_without_retries(self):
+        """С явным таймаутом сам запрос делается одной попыткой и прерывается вовремя"""
+        start = time.perf_counter()
+        with self.assertRaises(ConnectionError):
+            currenties.get_currencies(["USD"], f"{self.base}/hang/92.json", timeout=0.3)
+        self.assertLess(time.perf_counter() - start, RatesHandler.hang / 2)
+
+    def test_archive_urls(self):
+        """Адрес на каждый день диапазона"""
+        urls = archive_urls(datetime.date(2024, 2, 28), datetime.date(2024, 3, 1))
+        self.assertEqual(len(urls), 3)
+        self.assertTrue(urls[1].endswith("/archive/2024/02/29/daily_json.js"))
+        with self.assertRaises(ValueError):
+            archive_urls(datetime.date(2024, 3, 1), datetime.date(2024, 2, 1))
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Тесты объединения одновременных запросов"""
+
+    def run_concurrently(self, flight, key, func, count=5):
+        """Первый поток выполняет func, остальные подключаются к нему"""
+        results = []
+
+        def worker():
+            try:
+                results.append(flight.do(key, func))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def wait_waiters(self, flight, key, count):
+        for _ in range(500):
+            if flight.in_flight(key) == count:
+                return
+            time.sleep(0.01)
+        self.fail("потоки не дождались вызова")
+
+    def test_shared_result(self):
+        """Одновременные вызовы выполняют func один раз"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {"USD": 90.0}
+
+        threads, results = self.run_concurrently(flight, "url", fetch)
+        self.wait_waiters(flight, "url", 5)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"USD": 90.0}] * 5)
+        self.assertEqual(flight.in_flight("url"), 0)
+        self.assertEqual(flight.do("url", lambda: "again"), "again")
+
+    def test_shared_error(self):
+        """Исключение получают все ожидающие"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise ConnectionError("down")
+
+        threads, results = self.run_concurrently(flight, "url", fetch)
+        self.wait_waiters(flight, "url", 5)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+        # у каждого потока своё исключение, исходное - в __cause__ у ждавших
+        self.assertEqual(len({id(result) for result in results}), 5)
+        original = [result for result in results if result.__cause__ is None]
+        self.assertEqual(len(original), 1)
+        for result in results:
+            if result is not original[0]:
+                self.assertIs(result.__cause__, original[0])
+                self.assertEqual(result.args, ("down",))
+
+    def test_cache_coalesces_misses(self):
+        """Одновременные промахи кэша дают один запрос к серверу"""
+        release = threading.Event()
+
+        def slow_get(url, **kwargs):
+            release.wait(5)
+            return make_response(data={"a": 1})
+
+        cache = ResponseCache(ttl=60)
+        with patch("http_cache.get_session") as session:
+            session.return_value.get.side_effect = slow_get
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(cache.get("http://example.test/")))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            self.wait_waiters(cache._flight, "http://example.test/", 4)
+            release.set()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(session.return_value.get.call_count, 1)
+        self.assertEqual(results, [{"a": 1}] * 4)
+
+    def test_wait_timeout(self):
+        """Поток с таймаутом не ждёт зависший запрос без таймаута"""
+        flight = SingleFlight()
+        release = threading.Event()
+        threads, results = self.run_concurrently(flight, "url", lambda: release.wait(5), count=1)
+        self.wait_waiters(flight, "url", 1)
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            flight.do("url", lambda: None, wait_timeout=0.1)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(flight.in_flight("url"), 1)
+        release.set()
+        threads[0].join()
+        self.assertEqual(results, [True])
+
+        def slow_get(url, **kwargs):
+            release.wait(5)
+            return make_response(data={"a": 1})
+
+        cache = ResponseCache(ttl=60)
+        release.clear()
+        with patch("http_cache.get_session") as session:
+            session.return_value.get.side_effect = slow_get
+            leader = threading.Thread(target=cache.get, args=("http://example.test/",))
+            leader.start()
+            self.wait_waiters(cache._flight, "http://example.test/", 1)
+            start = time.monotonic()
+            with self.assertRaises(requests.Timeout):
+                cache.get("http://example.test/", timeout=0.1)
+            self.assertLess(time.monotonic() - start, 2)
+            release.set()
+            leader.join()
+        self.assertEqual(cache.get("http://example.test/", timeout=0.1), {"a": 1})
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
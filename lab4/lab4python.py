@@ -1,8 +1,13 @@
-import timeit
-import matplotlib.pyplot as plt
+import os
+import sys
 import random
+from bisect import bisect_right, insort
+from collections import OrderedDict
 from functools import lru_cache
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench import make_parser, run
+
 
 
 
@@ -13,6 +18,38 @@ def fact_recursive(n: int) -> int:
     return n * fact_recursive(n - 1)
 
 
+def fact_recursive_stack(n: int, chunk: int = 32) -> int:
+    """
+    Рекурсивный факториал без рекурсии Python.
+
+    Рекурсия «произведение [lo, hi) = левая половина * правая половина»
+    выполняется на явном стеке, поэтому RecursionError не возникает
+    при любом n. Отрезки короче chunk перемножаются простым циклом.
+    """
+    if n < 2:
+        return 1
+    tasks = [(1, n + 1)]  # отрезки [lo, hi) или None - «перемножить два результата»
+    results = []
+    while tasks:
+        task = tasks.pop()
+        if task is None:
+            right = results.pop()
+            results.append(results.pop() * right)
+            continue
+        lo, hi = task
+        if hi - lo <= chunk:
+            res = 1
+            for i in range(lo, hi):
+                res *= i
+            results.append(res)
+        else:
+            mid = (lo + hi) // 2
+            tasks.append(None)
+            tasks.append((mid, hi))
+            tasks.append((lo, mid))
+    return results[0]
+
+
 def fact_iterative(n: int) -> int:
     """Нерекурсивный факториал"""
     res = 1
@@ -20,12 +57,50 @@ def fact_iterative(n: int) -> int:
         res *= i
     return res
 
+
+def _odd_product(lo: int, hi: int) -> int:
+    """Произведение нечётных чисел из [lo, hi), lo и hi нечётные"""
+    count = (hi - lo) // 2
+    if count <= 16:
+        res = 1
+        for i in range(lo, hi, 2):
+            res *= i
+        return res
+    # делим диапазон пополам, чтобы перемножать числа сопоставимой длины
+    mid = lo + 2 * (count // 2)
+    return _odd_product(lo, mid) * _odd_product(mid, hi)
+
+
+def fact_binary_split(n: int) -> int:
+    """
+    Факториал методом двоичного разбиения (binary splitting).
+
+    Нечётная часть n! равна произведению произведений нечётных чисел
+    до n >> i по всем i, а степень двойки равна n - popcount(n).
+    Произведения строятся деревом, поэтому большие числа перемножаются
+    сбалансированно, а не по одному множителю, как в fact_iterative.
+    """
+    if n < 2:
+        return 1
+    odd_part = 1  # произведение нечётных чисел до текущего n >> i
+    res = 1
+    prev = 1
+    for shift in range(n.bit_length() - 1, -1, -1):
+        cur = n >> shift
+        lo = (prev + 1) | 1
+        hi = (cur + 1) | 1
+        if lo < hi:
+            odd_part *= _odd_product(lo, hi)
+        res *= odd_part
+        prev = cur
+    return res << (n - bin(n).count("1"))
+
 @lru_cache
 def fact_recursive_cache(n: int) -> int:
     """Рекурсивный факториал"""
     if n == 0:
         return 1
-    return n * fact_recursive(n - 1)
+    return n * fact_recursive_cache(n - 1)
 
 @lru_cache
 def fact_iterative_cache(n: int) -> int:
@@ -36,40 +111,98 @@ def fact_iterative_cache(n: int) -> int:
     return res
 
 
-def benchmark(func, n, repeat=5):
-    """Возвращает среднее время выполнения func(n)"""
-    times = timeit.repeat(lambda: func(n), number=1, repeat=repeat)
-    return min(times)
-
-
-
-def main():
+class FactorialStore:
+    """
+    Кэш факториалов с контрольными точками.
+
+    Хранит n! только для n, кратных step, и для последних запрошенных n.
+    Любое n считается от ближайшей меньшей контрольной точки, поэтому
+    после 290! значение 300! требует лишь нескольких умножений.
+    Число точек ограничено max_checkpoints, лишние вытесняются по LRU.
+    """
+
+    def __init__(self, step: int = 64, max_checkpoints: int = 256):
+        if step < 1:
+            raise ValueError("step должен быть положительным")
+        if max_checkpoints < 1:
+            raise ValueError("max_checkpoints должен быть положительным")
+        self.step = step
+        self.max_checkpoints = max_checkpoints
+        self._values = OrderedDict()  # n -> n!, порядок для LRU
+        self._keys = []  # отсортированные n для поиска ближайшей точки
+
+    def __len__(self):
+        return len(self._values)
+
+    def _remember(self, n: int, value: int):
+        if n in self._values:
+            self._values.move_to_end(n)
+            return
+        self._values[n] = value
+        insort(self._keys, n)
+        if len(self._values) > self.max_checkpoints:
+            old, _ = self._values.popitem(last=False)
+            self._keys.pop(bisect_right(self._keys, old) - 1)
+
+    def get(self, n: int) -> int:
+        """Возвращает n!, продолжая счёт от ближайшей контрольной точки"""
+        if n < 0:
+            raise ValueError("Факториал отрицательного числа не определён")
+        idx = bisect_right(self._keys, n) - 1
+        if idx >= 0:
+            i = self._keys[idx]
+            res = self._values[i]
+            self._values.move_to_end(i)
+        else:
+            i, res = 0, 1
+        while i < n:
+            # идём до следующего кратного step (или до самого n)
+            stop = min((i // self.step + 1) * self.step, n)
+            for k in range(i + 1, stop + 1):
+                res *= k
+            i = stop
+            if i % self.step == 0:
+                self._remember(i, res)
+        if n > 0:
+            self._remember(n, res)
+        return res
+
+    __call__ = get
+
+    def clear(self):
+        """Удаляет все контрольные точки"""
+        self._values.clear()
+        self._keys.clear()
+
+
+_factorial_store = FactorialStore()
+
+
+def fact_store_cache(n: int) -> int:
+    """Факториал с инкрементальным кэшем контрольных точек"""
+    return _factorial_store.get(n)
+
+
+# Серии для сравнения: подпись на графике -> функция
+FUNCTIONS = {
+    "Рекурсивный": fact_recursive,
+    "Рекурсивный на явном стеке": fact_recursive_stack,
+    "Итеративный": fact_iterative,
+    "Рекурсивный с lru_cache": fact_recursive_cache,
+    "Итеративный с lru_cache": fact_iterative_cache,
+    "Двоичное разбиение": fact_binary_split,
+    "Кэш контрольных точек": fact_store_cache,
+}
+
+
+def main(argv=None):
+    args = make_parser("Сравнение реализаций факториала").parse_args(argv)
     # фиксированный набор данных
     random.seed(42)
     test_data = list(range(10, 300, 10))
 
-    res_recursive = []
-    res_iterative = []
-    res_recursive_cache = []
-    res_iterative_cache = []
-
-    for n in test_data:
-      res_recursive.append(benchmark(fact_recursive, n))
-      res_iterative.append(benchmark(fact_iterative, n))
-      res_recursive_cache.append(benchmark(fact_recursive_cache, n))
-      res_iterative_cache.append(benchmark(fact_iterative_cache, n))
-
-    # Визуализация
-    plt.plot(test_data, res_recursive, label="Рекурсивный")
-    plt.plot(test_data, res_iterative, label="Итеративный")
-    plt.plot(test_data, res_recursive_cache, label="Рекурсивный с lru_cache")
-    plt.plot(test_data, res_iterative_cache, label="Итеративный с lru_cache")
-    plt.xlabel("n")
-    plt.ylabel("Время (сек)")
-    plt.title("Сравнение рекурсивного и итеративного факториала")
-    plt.legend()
-    plt.show()
+    return run(FUNCTIONS, test_data, args, title="Сравнение рекурсивного и итеративного факториала", xlabel="n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
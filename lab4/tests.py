@@ -0,0 +1,61 @@
+import math
+import unittest
+
+from lab4python import (fact_recursive, fact_recursive_stack, fact_iterative,
+                        fact_binary_split, FactorialStore)
+
+
+class TestFactorial(unittest.TestCase):
+
+    def test_recursive_stack(self):
+        """Проверка совпадения с рекурсивным факториалом"""
+        for n in range(0, 300):
+            self.assertEqual(fact_recursive_stack(n), fact_recursive(n))
+
+    def test_recursive_stack_deep(self):
+        """Большие n не вызывают RecursionError"""
+        self.assertEqual(fact_recursive_stack(20000), math.factorial(20000))
+        self.assertEqual(fact_recursive_stack(5000, chunk=1), math.factorial(5000))
+
+    def test_binary_split_small(self):
+        """Проверка совпадения с итеративным факториалом на малых n"""
+        for n in range(0, 300):
+            self.assertEqual(fact_binary_split(n), fact_iterative(n))
+
+    def test_binary_split_large(self):
+        """Проверка на больших n, включая степени двойки и соседние числа"""
+        for n in (1023, 1024, 1025, 5000):
+            self.assertEqual(fact_binary_split(n), math.factorial(n))
+
+
+class TestFactorialStore(unittest.TestCase):
+
+    def test_values(self):
+        """Проверка значений при произвольном порядке запросов"""
+        store = FactorialStore(step=8)
+        for n in (50, 10, 0, 51, 300, 299, 7):
+            self.assertEqual(store.get(n), math.factorial(n))
+
+    def test_resume_from_checkpoint(self):
+        """Следующее n считается от ближайшей контрольной точки"""
+        store = FactorialStore(step=64)
+        store.get(290)
+        self.assertIn(256, store._values)
+        self.assertIn(290, store._values)
+        self.assertEqual(store.get(300), math.factorial(300))
+
+    def test_eviction(self):
+        """Число контрольных точек не превышает max_checkpoints"""
+        store = FactorialStore(step=4, max_checkpoints=3)
+        for n in range(0, 100, 5):
+            self.assertEqual(store(n), math.factorial(n))
+            self.assertLessEqual(len(store), 3)
+
+    def test_negative(self):
+        """Проверка выброса ValueError для отрицательного n"""
+        with self.assertRaises(ValueError):
+            FactorialStore().get(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
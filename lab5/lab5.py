@@ -1,4 +1,6 @@
 import collections
+import json
+import sys
 def gen_bin_tree(height = 3, root = 11, l_b=lambda x: x ** 2, r_b=lambda y : 2 + y ** 2):
     '''
     Функция, создающая бинарное дерево
@@ -38,14 +40,76 @@ def gen_bin_tree(height = 3, root = 11, l_b=lambda x: x ** 2, r_b=lambda y : 2 +
     return root_base
     ''' Возвращает дерево в виде словаря'''
 
+_END = object()  # признак исчерпанного итератора
+
+
+def _json_key(key):
+    """Ключ словаря как строка JSON - по тем же правилам, что в json.dumps"""
+    if isinstance(key, str):
+        return json.dumps(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        # True -> "true", None -> "null", float(inf) -> "Infinity"
+        return json.dumps(json.dumps(key))
+    raise TypeError(f"Ключ должен быть str, int, float, bool или None, а не {type(key).__name__}")
+
+
+def iter_tree_json(tree, indent=None):
+    """
+    Генератор кусков JSON-представления дерева.
+
+    Даёт тот же текст, что json.dumps(tree, indent=indent), но без
+    рекурсии и без сборки всей строки в памяти: в каждый момент
+    хранится только стек открытых словарей/списков.
+    """
+    if indent is not None and not isinstance(indent, str):
+        indent = ' ' * indent
+    item_sep = ',' if indent is not None else ', '
+
+    stack = []  # [итератор по элементам, это словарь, первый элемент, глубина]
+
+    def open_value(value, depth):
+        if isinstance(value, dict) and value:
+            stack.append([iter(value.items()), True, True, depth + 1])
+            return '{'
+        if isinstance(value, (list, tuple)) and value:
+            stack.append([iter(value), False, True, depth + 1])
+            return '['
+        return json.dumps(value)
+
+    yield open_value(tree, 0)
+    while stack:
+        frame = stack[-1]
+        items, is_dict, first, depth = frame
+        item = next(items, _END)
+        if item is _END:
+            stack.pop()
+            close = '}' if is_dict else ']'
+            yield close if indent is None else '\n' + indent * (depth - 1) + close
+            continue
+        prefix = '' if first else item_sep
+        if indent is not None:
+            prefix += '\n' + indent * depth
+        frame[2] = False
+        if is_dict:
+            key, item = item
+            prefix += _json_key(key) + ': '
+        yield prefix + open_value(item, depth)
+
+
+def write_tree_json(tree, file, indent=None):
+    """Записывает дерево в файловый объект по частям"""
+    for chunk in iter_tree_json(tree, indent):
+        file.write(chunk)
+
+
 def display_tree_json(tree):
     """
     JSON-представление дерева.
     """
-    import json
     print("\nJSON ПРЕДСТАВЛЕНИЕ:")
     print("=" * 30)
-    print(json.dumps(tree, indent=3))
+    write_tree_json(tree, sys.stdout, indent=3)
+    print()
 
 def main():
     height = int(input('высота дерева: '))
@@ -0,0 +1,35 @@
+import io
+import json
+import unittest
+
+from lab5 import gen_bin_tree, iter_tree_json, write_tree_json
+
+
+class TestTreeJson(unittest.TestCase):
+
+    def test_same_as_json_dumps(self):
+        """Потоковый вывод совпадает с json.dumps при любом отступе"""
+        trees = [gen_bin_tree(h) for h in range(0, 6)]
+        trees += [{'11': [{'121': []}, {'123': []}]}, {'a': [], 'b': {}, 1: 2.5}, [], 'й']
+        trees += [{True: 1, False: 0, None: [1]}, {2.5: 'a', -0.0: 'b', float('inf'): 'c', 10 ** 20: 'd'}]
+        for tree in trees:
+            for indent in (None, 0, 3, '\t'):
+                self.assertEqual(''.join(iter_tree_json(tree, indent)),
+                                 json.dumps(tree, indent=indent))
+        with self.assertRaises(TypeError):
+            ''.join(iter_tree_json({(1, 2): 3}))
+
+    def test_deep_tree(self):
+        """Глубина дерева не ограничена пределом рекурсии"""
+        tree = node = {'value': 0}
+        for i in range(1, 5000):
+            node['left'] = {'value': i}
+            node = node['left']
+        out = io.StringIO()
+        write_tree_json(tree, out, indent=3)
+        self.assertTrue(out.getvalue().startswith('{\n   "value": 0,\n   "left": {'))
+        self.assertEqual(out.getvalue().count('"value"'), 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,18 @@
+"""
+Построение бинарных деревьев с потомками l_b(x) и r_b(x).
+
+Основная точка входа - build_tree(height, root, l_b, r_b, backend=...),
+представления перечислены в BACKENDS.
+"""
+from .branches import left_branch, right_branch
+from .dict_tree import build_tree_dict, build_tree_dict_recursive
+from .array_tree import ArrayTree, build_tree_array
+from .vectorized import build_tree_vectorized
+from .lazy import LazyNode, LazyTree, build_tree_lazy
+from .streaming import index_to_path, iter_bfs, iter_dfs, iter_nodes
+from .dag import DagNode, TreeDag, build_tree_shared
+from .parallel import build_tree_parallel
+from .serialize import BinaryTreeFile, iter_json, write_json, write_binary
+from .mmap_store import MmapTree, build_tree_mmap
+from .builders import BACKENDS, build_tree, register_backend
+from .reduce import Reducer, LevelSum, LevelMinMax, LeafCount, Histogram, build_and_reduce
@@ -0,0 +1,130 @@
+from array import array
+
+from .branches import left_branch, right_branch
+
+
+class ArrayTree:
+    """
+    Полное бинарное дерево в неявной форме кучи.
+
+    Узел i хранится в плоском массиве, его потомки - в 2i+1 и 2i+2,
+    поэтому вместо словаря на каждый узел тратится одна ячейка массива:
+    8 байт для array('q'), если значения помещаются в int64, либо
+    ссылка на объект в list для больших и нецелых значений.
+    """
+
+    def __init__(self, height: int, values):
+        if len(values) != 2 ** height - 1:
+            raise ValueError("Число значений не соответствует высоте дерева")
+        self.height = height
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i: int):
+        return self.values[i]
+
+    @property
+    def root(self):
+        return self.values[0]
+
+    def left(self, i: int):
+        '''Индекс левого потомка или None для листа'''
+        child = 2 * i + 1
+        return child if child < len(self.values) else None
+
+    def right(self, i: int):
+        '''Индекс правого потомка или None для листа'''
+        child = 2 * i + 2
+        return child if child < len(self.values) else None
+
+    @staticmethod
+    def parent(i: int):
+        '''Индекс родителя или None для корня'''
+        return (i - 1) // 2 if i > 0 else None
+
+    @staticmethod
+    def level(i: int) -> int:
+        '''Уровень узла, корень на уровне 0'''
+        return (i + 1).bit_length() - 1
+
+    def is_leaf(self, i: int) -> bool:
+        return 2 * i + 1 >= len(self.values)
+
+    @staticmethod
+    def index_of(path: str) -> int:
+        '''Индекс узла по пути из корня, например "LRRL"'''
+        i = 0
+        for step in path.upper():
+            if step == 'L':
+                i = 2 * i + 1
+            elif step == 'R':
+                i = 2 * i + 2
+            else:
+                raise ValueError(f"Неизвестный шаг пути: {step!r}")
+        return i
+
+    def value_at(self, path: str):
+        '''Значение узла по пути из корня'''
+        i = self.index_of(path)
+        if i >= len(self.values):
+            raise IndexError(f"Путь {path!r} длиннее высоты дерева")
+        return self.values[i]
+
+    def level_values(self, level: int):
+        '''Значения одного уровня слева направо'''
+        return self.values[2 ** level - 1: 2 ** (level + 1) - 1]
+
+    def to_dict(self):
+        '''
+        Преобразует дерево в формат build_tree_iterative:
+        {'value': ..., 'left': ..., 'right': ...}, у листьев только 'value'.
+        '''
+        if len(self.values) == 0:
+            return None
+        internal = len(self.values) // 2  # узлы с потомками
+        # tolist превращает элементы array/numpy в обычные числа Python
+        values = self.values.tolist() if hasattr(self.values, 'tolist') else self.values
+        nodes = [{'value': v} for v in values]
+        for i in range(internal):
+            nodes[i]['left'] = nodes[2 * i + 1]
+            nodes[i]['right'] = nodes[2 * i + 2]
+        if internal == 0:
+            nodes[0]['left'] = nodes[0]['right'] = None
+        return nodes[0]
+
+
+def _append(values, value):
+    '''Добавляет значение, переходя от array к list при переполнении типа'''
+    try:
+        values.append(value)
+    except (OverflowError, TypeError):
+        values = list(values)
+        values.append(value)
+    return values
+
+
+def build_tree_array(height = 3, root = 11, l_b=left_branch, r_b=right_branch, typecode='q'):
+    '''
+    Функция, создающая бинарное дерево в виде ArrayTree
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    typecode: тип элементов array; None - сразу хранить значения в list
+    '''
+
+    if type(height) != int or height < 0:
+        raise ValueError("Высота дерева должна быть неотрицательным целым числом")
+    if height == 0:
+        return None
+
+    values = array(typecode) if typecode else []
+    values = _append(values, root)
+    # уровни заполняются по порядку, поэтому потомки узла i попадают в 2i+1 и 2i+2
+    for i in range(2 ** (height - 1) - 1):
+        parent = values[i]
+        values = _append(values, l_b(parent))
+        values = _append(values, r_b(parent))
+    return ArrayTree(height, values)
@@ -0,0 +1,7 @@
+def left_branch(root: int) -> int:
+    '''Левый потомок'''
+    return root ** 2
+
+def right_branch(root: int) -> int:
+    ''' Правый потомок '''
+    return 2+root**2
@@ -0,0 +1,62 @@
+import numbers
+
+from .array_tree import build_tree_array
+from .branches import left_branch, right_branch
+from .dag import build_tree_shared
+from .dict_tree import build_tree_dict, build_tree_dict_recursive
+from .lazy import build_tree_lazy
+from .mmap_store import build_tree_mmap
+from .parallel import build_tree_parallel
+from .vectorized import build_tree_vectorized
+
+
+def _build_tree_mmap(height, root, l_b, r_b, path, **options):
+    return build_tree_mmap(path, height, root, l_b, r_b, **options)
+
+
+# Имя представления -> функция (height, root, l_b, r_b, **options)
+BACKENDS = {
+    'dict': build_tree_dict,                      # вложенные словари
+    'dict_recursive': build_tree_dict_recursive,  # то же, рекурсивно
+    'array': build_tree_array,                    # ArrayTree, неявная куча
+    'vectorized': build_tree_vectorized,          # ArrayTree, уровни через numpy
+    'parallel': build_tree_parallel,              # ArrayTree, поддеревья в пуле процессов
+    'lazy': build_tree_lazy,                      # LazyTree, узлы по требованию
+    'shared': build_tree_shared,                  # TreeDag, общие поддеревья
+    'mmap': _build_tree_mmap,                     # MmapTree в файле, нужен path
+}
+
+
+def register_backend(name: str, builder):
+    '''Добавляет представление дерева, доступное через build_tree(backend=name)'''
+    if not callable(builder):
+        raise TypeError("builder должен быть вызываемым объектом")
+    BACKENDS[name] = builder
+
+
+def build_tree(height = 3, root = 11, l_b=left_branch, r_b=right_branch, backend='dict', **options):
+    '''
+    Единая точка построения бинарного дерева
+    height: высота дерева (неотрицательное целое)
+    root: значение корневого узла (число)
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    backend: представление результата, ключ BACKENDS
+    options: параметры конкретного представления, например path для
+             'mmap', workers для 'parallel', memoize для 'lazy'
+
+    Все представления строят одно и то же дерево; для height == 0
+    возвращается None.
+    '''
+
+    if type(height) != int:
+        raise TypeError("Введите целое число для высоты")
+    if height < 0:
+        raise ValueError("Высота дерева не может быть отрицательной")
+    if isinstance(root, bool) or not isinstance(root, numbers.Number):
+        raise TypeError("Введите числовое значение для корня")
+    if not callable(l_b) or not callable(r_b):
+        raise TypeError("l_b и r_b должны быть функциями")
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестное представление {backend!r}, доступны: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](height, root, l_b, r_b, **options)
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+
+from .branches import left_branch, right_branch
+
+
+class DagNode:
+    """Узел дерева, который может быть общим для нескольких родителей"""
+
+    __slots__ = ('value', 'height', 'left', 'right')
+
+    def __init__(self, value, height: int, left=None, right=None):
+        self.value = value
+        self.height = height
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"DagNode(value={self.value!r}, height={self.height})"
+
+
+class TreeDag:
+    """
+    Дерево, у которого одинаковые поддеревья хранятся один раз.
+
+    Поддерево определяется только значением корня и оставшейся высотой,
+    поэтому при повторе пары (value, height) используется уже
+    построенный узел. Логически это полное дерево из 2**height - 1
+    узлов, физически - ориентированный ациклический граф.
+
+    root: корневой DagNode
+    unique_nodes: число реально созданных узлов
+    cache_hits: сколько поддеревьев взято из кэша вместо построения
+    """
+
+    def __init__(self, root: DagNode, unique_nodes: int, cache_hits: int):
+        self.root = root
+        self.unique_nodes = unique_nodes
+        self.cache_hits = cache_hits
+
+    @property
+    def height(self) -> int:
+        return self.root.height
+
+    @property
+    def total_nodes(self) -> int:
+        '''Число узлов в развёрнутом дереве'''
+        return 2 ** self.height - 1
+
+    def value_at(self, path: str):
+        '''Значение узла по пути из корня, например "LRRL"'''
+        node = self.root
+        for step in path.upper():
+            if node.left is None:
+                raise IndexError(f"Путь {path!r} длиннее высоты дерева")
+            if step == 'L':
+                node = node.left
+            elif step == 'R':
+                node = node.right
+            else:
+                raise ValueError(f"Неизвестный шаг пути: {step!r}")
+        return node.value
+
+    def to_dict(self):
+        '''
+        Дерево в формате build_tree_iterative. Общие поддеревья
+        становятся общими словарями, поэтому память остаётся
+        пропорциональной unique_nodes.
+        '''
+        converted = {}  # id(DagNode) -> словарь
+        stack = [self.root]
+        while stack:
+            node = stack[-1]
+            if id(node) in converted:
+                stack.pop()
+                continue
+            if node.left is None:
+                converted[id(node)] = {'value': node.value}
+                stack.pop()
+                continue
+            pending = [child for child in (node.left, node.right) if id(child) not in converted]
+            if pending:
+                stack.extend(pending)
+                continue
+            converted[id(node)] = {'value': node.value,
+                                   'left': converted[id(node.left)],
+                                   'right': converted[id(node.right)]}
+            stack.pop()
+        result = converted[id(self.root)]
+        if self.root.left is None:
+            result = {'value': self.root.value, 'left': None, 'right': None}
+        return result
+
+
+def build_tree_shared(height = 3, root = 11, l_b=left_branch, r_b=right_branch, max_cache=65536):
+    '''
+    Функция, создающая бинарное дерево с общими поддеревьями (TreeDag)
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    max_cache: сколько пар (значение, высота) помнить одновременно;
+               давно не использованные вытесняются (LRU)
+
+    Значения должны быть хешируемыми. Если ветвящие функции дают
+    повторяющиеся значения (x**2 для x и -x, остатки по модулю),
+    работа пропорциональна числу различных пар (value, height),
+    а не 2**height.
+    '''
+
+    if type(height) != int or height < 0:
+        raise ValueError("Высота дерева должна быть неотрицательным целым числом")
+    if max_cache < 1:
+        raise ValueError("max_cache должен быть положительным")
+    if height == 0:
+        return None
+
+    cache = OrderedDict()
+    stats = {'created': 0, 'hits': 0}
+
+    def build(value, h):
+        # тип входит в ключ, чтобы 1, 1.0 и True не считались одним поддеревом
+        key = (type(value), value, h)
+        node = cache.get(key)
+        if node is not None:
+            cache.move_to_end(key)
+            stats['hits'] += 1
+            return node
+        if h == 1:
+            node = DagNode(value, 1)
+        else:
+            node = DagNode(value, h, build(l_b(value), h - 1), build(r_b(value), h - 1))
+        stats['created'] += 1
+        cache[key] = node
+        if len(cache) > max_cache:
+            cache.popitem(last=False)
+        return node
+
+    root_node = build(root, height)
+    return TreeDag(root_node, stats['created'], stats['hits'])
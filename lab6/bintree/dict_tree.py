@@ -0,0 +1,53 @@
+import collections
+
+from .branches import left_branch, right_branch
+
+
+def build_tree_dict(height = 3, root = 11, l_b=left_branch, r_b=right_branch):
+    '''
+    Функция, создающая бинарное дерево из словарей (обход в ширину)
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+
+    Узлы имеют вид {'value': ..., 'left': ..., 'right': ...}, у листьев
+    только 'value'; дерево из одного корня - {'value': root, 'left': None,
+    'right': None}. Высота 0 даёт None.
+    '''
+
+    if height == 0:
+        return None
+    root_base = {'value': root, 'left': None, 'right': None}
+
+    # очередь для обхода уровня: (узел, текущий уровень)
+    queue = collections.deque()
+    queue.append((root_base, 1))
+    while queue:
+        current_root, level = queue.popleft()
+        if level < height:
+            left_root = {'value': l_b(current_root['value'])}
+            right_root = {'value': r_b(current_root['value'])}
+            current_root['left'] = left_root
+            current_root['right'] = right_root
+            queue.append((left_root, level + 1))
+            queue.append((right_root, level + 1))
+    return root_base
+
+
+def build_tree_dict_recursive(height = 3, root = 11, l_b=left_branch, r_b=right_branch):
+    '''
+    Рекурсивный вариант build_tree_dict с тем же форматом результата
+    (глубина рекурсии равна высоте дерева).
+    '''
+
+    def build(value, h):
+        if h == 1:
+            return {'value': value}
+        return {'value': value, 'left': build(l_b(value), h - 1), 'right': build(r_b(value), h - 1)}
+
+    if height == 0:
+        return None
+    if height == 1:
+        return {'value': root, 'left': None, 'right': None}
+    return build(root, height)
@@ -0,0 +1,139 @@
+from .branches import left_branch, right_branch
+
+_UNSET = object()
+
+
+class LazyNode:
+    """
+    Узел ленивого дерева: потомки вычисляются через l_b/r_b только
+    при первом обращении к left/right.
+    """
+
+    __slots__ = ('value', 'level', '_tree', '_left', '_right')
+
+    def __init__(self, tree, value, level: int):
+        self._tree = tree
+        self.value = value
+        self.level = level
+        self._left = _UNSET
+        self._right = _UNSET
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.level + 1 >= self._tree.height
+
+    @property
+    def left(self):
+        if self._left is not _UNSET:
+            return self._left
+        node = None if self.is_leaf else LazyNode(self._tree, self._tree.l_b(self.value), self.level + 1)
+        if self._tree.memoize:
+            self._left = node
+        return node
+
+    @property
+    def right(self):
+        if self._right is not _UNSET:
+            return self._right
+        node = None if self.is_leaf else LazyNode(self._tree, self._tree.r_b(self.value), self.level + 1)
+        if self._tree.memoize:
+            self._right = node
+        return node
+
+    def __repr__(self):
+        return f"LazyNode(value={self.value!r}, level={self.level})"
+
+
+class LazyTree:
+    """
+    Бинарное дерево, узлы которого создаются по требованию.
+
+    Запрос значения по пути или крайнего листа стоит O(height)
+    вызовов l_b/r_b вместо построения всех 2**height - 1 узлов.
+    memoize: запоминать созданные узлы, чтобы повторные обращения
+             не вызывали l_b/r_b снова (память растёт с числом
+             посещённых узлов)
+    """
+
+    def __init__(self, height = 3, root = 11, l_b=left_branch, r_b=right_branch, memoize=True):
+        if type(height) != int or height < 1:
+            raise ValueError("Высота ленивого дерева должна быть положительным целым числом")
+        self.height = height
+        self.l_b = l_b
+        self.r_b = r_b
+        self.memoize = memoize
+        self.root = LazyNode(self, root, 0)
+
+    def node_at(self, path: str) -> LazyNode:
+        '''Узел по пути из корня, например "LRRL"'''
+        if len(path) >= self.height:
+            raise IndexError(f"Путь {path!r} длиннее высоты дерева")
+        node = self.root
+        for step in path.upper():
+            if step == 'L':
+                node = node.left
+            elif step == 'R':
+                node = node.right
+            else:
+                raise ValueError(f"Неизвестный шаг пути: {step!r}")
+        return node
+
+    def value_at(self, path: str):
+        '''Значение узла по пути из корня'''
+        if self.memoize:
+            return self.node_at(path).value
+        # без мемоизации узлы не нужны - считаем только значения
+        if len(path) >= self.height:
+            raise IndexError(f"Путь {path!r} длиннее высоты дерева")
+        value = self.root.value
+        for step in path.upper():
+            if step == 'L':
+                value = self.l_b(value)
+            elif step == 'R':
+                value = self.r_b(value)
+            else:
+                raise ValueError(f"Неизвестный шаг пути: {step!r}")
+        return value
+
+    def leftmost_leaf(self):
+        '''Значение самого левого листа'''
+        return self.value_at('L' * (self.height - 1))
+
+    def rightmost_leaf(self):
+        '''Значение самого правого листа'''
+        return self.value_at('R' * (self.height - 1))
+
+    def to_dict(self):
+        '''
+        Полностью строит дерево в формате build_tree_iterative
+        (все 2**height - 1 узлов - только для небольших деревьев).
+        '''
+        result = {'value': self.root.value}
+        if self.height == 1:
+            result['left'] = result['right'] = None
+            return result
+        stack = [(self.root, result)]
+        while stack:
+            node, out = stack.pop()
+            if node.is_leaf:
+                continue
+            left, right = node.left, node.right
+            out['left'] = {'value': left.value}
+            out['right'] = {'value': right.value}
+            stack.append((left, out['left']))
+            stack.append((right, out['right']))
+        return result
+
+
+def build_tree_lazy(height = 3, root = 11, l_b=left_branch, r_b=right_branch, memoize=True):
+    '''
+    Функция, создающая ленивое бинарное дерево (LazyTree)
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    memoize: запоминать вычисленные узлы
+    '''
+    if height == 0:
+        return None
+    return LazyTree(height, root, l_b, r_b, memoize)
@@ -0,0 +1,174 @@
+import mmap
+import os
+import sys
+from array import array
+
+from .array_tree import ArrayTree
+from .branches import left_branch, right_branch
+from .serialize import HEADER, MAGIC, VERSION, FIXED_KINDS
+
+
+class MmapTree:
+    """
+    Дерево в неявной форме кучи, хранящееся в файле, отображённом в память.
+
+    Формат совпадает с write_binary для видов 'q' (int64) и 'd' (float64),
+    поэтому файл читается и через BinaryTreeFile. Узел i лежит по смещению
+    заголовок + 8*i, так что доступ по индексу - O(1), а в памяти
+    процесса находятся только недавно затронутые страницы файла:
+    остальное ядро выгружает само.
+    """
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self._file = open(path, 'r+b' if writable else 'rb')
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Файл {path} пуст")
+        if len(self._mm) < HEADER.size:
+            self._mm.close()
+            self._file.close()
+            raise ValueError(f"Файл {path} слишком короткий для заголовка")
+        magic, version, kind, height, count, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or kind not in FIXED_KINDS:
+            self._mm.close()
+            self._file.close()
+            raise ValueError(f"Файл {path} не является деревом фиксированного формата")
+        if len(self._mm) < HEADER.size + 8 * count:
+            self._mm.close()
+            self._file.close()
+            raise ValueError(f"Файл {path} обрезан")
+        self.kind = kind.decode()
+        self.height = height
+        self._count = count
+        self._data = memoryview(self._mm)[HEADER.size: HEADER.size + 8 * count]
+        if sys.byteorder == 'little':
+            self._data = self._data.cast(self.kind)
+        else:
+            self._data = None  # порядок байт не совпадает - читаем через struct
+
+    @classmethod
+    def create(cls, path, height: int, kind='q'):
+        '''Создаёт файл под дерево высоты height, заполненный нулями'''
+        if type(height) != int or height < 1:
+            raise ValueError("Высота дерева должна быть положительным целым числом")
+        if kind not in ('q', 'd'):
+            raise ValueError(f"Неизвестный вид значений: {kind!r}")
+        count = 2 ** height - 1
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, kind.encode(), height, count, 0))
+            f.truncate(HEADER.size + 8 * count)  # разреженный файл, место выделяется при записи
+        return cls(path, writable=True)
+
+    def __len__(self):
+        return self._count
+
+    def _check_index(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("Индекс узла вне дерева")
+        return i
+
+    def __getitem__(self, i: int):
+        i = self._check_index(i)
+        if self._data is not None:
+            return self._data[i]
+        return FIXED_KINDS[self.kind.encode()].unpack_from(self._mm, HEADER.size + 8 * i)[0]
+
+    def __setitem__(self, i: int, value):
+        i = self._check_index(i)
+        if self._data is not None:
+            self._data[i] = value
+        else:
+            FIXED_KINDS[self.kind.encode()].pack_into(self._mm, HEADER.size + 8 * i, value)
+
+    def read_range(self, start: int, stop: int) -> array:
+        '''Значения узлов с индексами [start, stop) одним блоком'''
+        values = array(self.kind)
+        values.frombytes(self._mm[HEADER.size + 8 * start: HEADER.size + 8 * stop])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def write_range(self, start: int, values: array):
+        '''Записывает блок значений, начиная с индекса start'''
+        if sys.byteorder != 'little':
+            values = array(values.typecode, values)
+            values.byteswap()
+        data = values.tobytes()
+        self._mm[HEADER.size + 8 * start: HEADER.size + 8 * start + len(data)] = data
+
+    def value_at(self, path: str):
+        '''Значение узла по пути из корня, например "LRRL"'''
+        return self[ArrayTree.index_of(path)]
+
+    def level_values(self, level: int) -> array:
+        '''Значения одного уровня (уровень целиком читается в память)'''
+        return self.read_range(2 ** level - 1, 2 ** (level + 1) - 1)
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._data is not None:
+            self._data.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_tree_mmap(path, height = 3, root = 11, l_b=left_branch, r_b=right_branch,
+                    kind='q', chunk=65536):
+    '''
+    Функция, создающая бинарное дерево прямо в файле (MmapTree)
+    path: путь к файлу дерева (перезаписывается)
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    kind: 'q' - значения int64, 'd' - float64
+    chunk: сколько родителей обрабатывать за раз
+
+    Уровни заполняются по порядку, как в build_tree_iterative, но
+    родители читаются из файла блоками по chunk узлов, а потомки
+    записываются обратно блоками, поэтому в памяти одновременно
+    находится O(chunk) значений при любой высоте дерева.
+    Значения, не помещающиеся в int64, вызывают OverflowError.
+    '''
+
+    if chunk < 1:
+        raise ValueError("chunk должен быть положительным")
+    if height == 0:
+        return None
+    tree = MmapTree.create(path, height, kind)
+    try:
+        tree[0] = root
+        for level in range(height - 1):
+            first = 2 ** level - 1
+            last = 2 ** (level + 1) - 1
+            for start in range(first, last, chunk):
+                stop = min(start + chunk, last)
+                children = array(kind)
+                try:
+                    for value in tree.read_range(start, stop):
+                        children.append(l_b(value))
+                        children.append(r_b(value))
+                except OverflowError:
+                    raise OverflowError(f"Значение на уровне {level + 1} не помещается в {kind}; "
+                                        "используйте kind='d' или ArrayTree")
+                tree.write_range(2 * start + 1, children)
+        tree.flush()
+    except BaseException:
+        tree.close()
+        os.unlink(path)
+        raise
+    return tree
@@ -0,0 +1,85 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .array_tree import ArrayTree, build_tree_array
+from .branches import left_branch, right_branch
+
+
+def _build_subtree(root, height, l_b, r_b):
+    '''
+    Строит поддерево в процессе-исполнителе и возвращает его в
+    компактном виде: (typecode, байты array) или (None, список значений)
+    вместо вложенных словарей, которые дорого передавать через pickle.
+    '''
+    values = build_tree_array(height, root, l_b, r_b).values
+    if isinstance(values, array):
+        return values.typecode, values.tobytes()
+    return None, values
+
+
+def _unpack(typecode, payload):
+    if typecode is None:
+        return payload
+    values = array(typecode)
+    values.frombytes(payload)
+    return values
+
+
+def _default_split_depth(height, workers):
+    '''Глубина разбиения: примерно по 4 поддерева на процесс для балансировки'''
+    depth = max(1, (4 * workers - 1).bit_length())
+    return min(depth, height - 1)
+
+
+def build_tree_parallel(height = 3, root = 11, l_b=left_branch, r_b=right_branch,
+                        split_depth=None, workers=None):
+    '''
+    Функция, создающая бинарное дерево в пуле процессов
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    split_depth: уровень, на котором дерево делится на независимые поддеревья
+                 (2**split_depth задач); по умолчанию - около 4 задач на процесс
+    workers: число процессов (по умолчанию - число ядер)
+
+    Верхние split_depth уровней строятся в текущем процессе, поддеревья
+    ниже - параллельно в ProcessPoolExecutor, затем уровни поддеревьев
+    склеиваются в одно ArrayTree. l_b и r_b должны передаваться через
+    pickle (функции уровня модуля, а не lambda).
+    '''
+
+    if type(height) != int or height < 0:
+        raise ValueError("Высота дерева должна быть неотрицательным целым числом")
+    if height == 0:
+        return None
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers должен быть положительным")
+    if split_depth is None:
+        split_depth = _default_split_depth(height, workers)
+    if split_depth < 0:
+        raise ValueError("split_depth не может быть отрицательным")
+    if split_depth == 0 or split_depth >= height:
+        return build_tree_array(height, root, l_b, r_b)
+
+    top = build_tree_array(split_depth + 1, root, l_b, r_b)
+    sub_roots = top.level_values(split_depth)
+    sub_height = height - split_depth
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_build_subtree, value, sub_height, l_b, r_b) for value in sub_roots]
+        subtrees = [_unpack(*future.result()) for future in futures]
+
+    compact = isinstance(top.values, array) and all(isinstance(sub, array) for sub in subtrees)
+    values = top.values[:2 ** split_depth - 1]
+    if not compact:
+        values = list(values)
+    # склейка: уровень j всех поддеревьев подряд образует уровень split_depth + j
+    for j in range(sub_height):
+        start, stop = 2 ** j - 1, 2 ** (j + 1) - 1
+        for sub in subtrees:
+            values.extend(sub[start:stop])
+    return ArrayTree(height, values)
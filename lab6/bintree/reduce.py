@@ -0,0 +1,140 @@
+from abc import ABC, abstractmethod
+
+from .branches import left_branch, right_branch
+from .streaming import iter_nodes
+
+
+class Reducer(ABC):
+    """
+    Агрегат, который считается за один проход по узлам дерева.
+
+    start(height) вызывается перед обходом, add(index, level, value) -
+    для каждого узла, result() возвращает итог.
+    """
+
+    def start(self, height: int):
+        self.height = height
+
+    @abstractmethod
+    def add(self, index: int, level: int, value):
+        ...
+
+    @abstractmethod
+    def result(self):
+        ...
+
+
+class LevelSum(Reducer):
+    """Сумма значений на каждом уровне (список по уровням)"""
+
+    def start(self, height):
+        super().start(height)
+        self.sums = [0] * height
+
+    def add(self, index, level, value):
+        self.sums[level] += value
+
+    def result(self):
+        return self.sums
+
+
+class LevelMinMax(Reducer):
+    """Минимум и максимум на каждом уровне (список пар (min, max))"""
+
+    def start(self, height):
+        super().start(height)
+        self.bounds = [None] * height
+
+    def add(self, index, level, value):
+        bounds = self.bounds[level]
+        if bounds is None:
+            self.bounds[level] = (value, value)
+        elif value < bounds[0]:
+            self.bounds[level] = (value, bounds[1])
+        elif value > bounds[1]:
+            self.bounds[level] = (bounds[0], value)
+
+    def result(self):
+        return self.bounds
+
+
+class LeafCount(Reducer):
+    """
+    Число листьев; с predicate - только листьев, для которых
+    predicate(value) истинно.
+    """
+
+    def __init__(self, predicate=None):
+        self.predicate = predicate
+
+    def start(self, height):
+        super().start(height)
+        self.count = 0
+
+    def add(self, index, level, value):
+        if level == self.height - 1 and (self.predicate is None or self.predicate(value)):
+            self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class Histogram(Reducer):
+    """
+    Гистограмма значений: {корзина: число узлов}.
+
+    bin_width: ширина корзины, корзина - value // bin_width
+    key: произвольная функция корзины (вместо bin_width)
+    leaves_only: учитывать только листья
+    """
+
+    def __init__(self, bin_width=None, key=None, leaves_only=False):
+        if bin_width is not None and key is not None:
+            raise ValueError("Задайте либо bin_width, либо key")
+        if bin_width is not None and bin_width <= 0:
+            raise ValueError("bin_width должен быть положительным")
+        self.bin_width = bin_width
+        self.key = key
+        self.leaves_only = leaves_only
+
+    def start(self, height):
+        super().start(height)
+        self.counts = {}
+
+    def add(self, index, level, value):
+        if self.leaves_only and level != self.height - 1:
+            return
+        if self.key is not None:
+            bucket = self.key(value)
+        elif self.bin_width is not None:
+            bucket = value // self.bin_width
+        else:
+            bucket = value
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+    def result(self):
+        return self.counts
+
+
+def build_and_reduce(height = 3, root = 11, l_b=left_branch, r_b=right_branch, reducers=(), order='bfs'):
+    '''
+    Считает агрегаты дерева во время его генерации, не строя дерево
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка
+    r_b: функция для вычисления правого потомка
+    reducers: список или словарь {имя: Reducer}
+    order: "bfs" - в памяти один уровень, "dfs" - O(height) узлов
+
+    Возвращает результаты в той же форме, что reducers: список или словарь.
+    '''
+    named = isinstance(reducers, dict)
+    items = list(reducers.values()) if named else list(reducers)
+    for reducer in items:
+        reducer.start(height)
+    for index, level, value in iter_nodes(height, root, l_b, r_b, order):
+        for reducer in items:
+            reducer.add(index, level, value)
+    if named:
+        return {name: reducer.result() for name, reducer in reducers.items()}
+    return [reducer.result() for reducer in items]
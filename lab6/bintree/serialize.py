@@ -0,0 +1,207 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from .array_tree import ArrayTree
+
+# Заголовок двоичного файла:
+# сигнатура, версия, вид значений, высота, число узлов, смещение таблицы
+# смещений (только для вида 'V'), выравнивание до 32 байт
+HEADER = struct.Struct('<4sBc2xIQQ4x')
+MAGIC = b'BTRE'
+VERSION = 1
+
+# Виды значений:
+# 'q' - int64, 'd' - float64: по 8 байт на узел, узел i по смещению 8*i;
+# 'V' - целые произвольной длины: байты значений подряд, затем таблица
+#       из count + 1 смещений uint64 (конец значения i - начало i + 1)
+FIXED_KINDS = {b'q': struct.Struct('<q'), b'd': struct.Struct('<d')}
+VARIABLE_KIND = b'V'
+
+
+def _scalar(value):
+    '''Числа numpy превращает в числа Python'''
+    return value.item() if hasattr(value, 'item') else value
+
+
+def iter_json(tree):
+    '''
+    Генератор кусков JSON дерева в формате build_tree_iterative
+    ({"value": ..., "left": ..., "right": ...}) прямо по индексам
+    неявной кучи, без построения словарей.
+
+    tree: ArrayTree, BinaryTreeFile или любая последовательность
+          значений в порядке уровней длины 2**height - 1
+    '''
+    count = len(tree)
+    if count == 0:
+        yield 'null'
+        return
+    if count == 1:
+        yield '{"value": ' + json.dumps(_scalar(tree[0])) + ', "left": null, "right": null}'
+        return
+    internal = count // 2
+    # на стеке индексы узлов и готовые куски текста (закрывающие скобки, ключи)
+    stack = [0]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        value = json.dumps(_scalar(tree[item]))
+        if item >= internal:
+            yield '{"value": ' + value + '}'
+            continue
+        yield '{"value": ' + value + ', "left": '
+        stack.append('}')
+        stack.append(2 * item + 2)
+        stack.append(', "right": ')
+        stack.append(2 * item + 1)
+
+
+def write_json(tree, file):
+    '''Записывает дерево в файловый объект в виде JSON по частям'''
+    for chunk in iter_json(tree):
+        file.write(chunk)
+
+
+def _kind_of(values):
+    if isinstance(values, array):
+        if values.typecode == 'q':
+            return b'q'
+        if values.typecode == 'd':
+            return b'd'
+    dtype = getattr(values, 'dtype', None)
+    if dtype is not None and dtype.kind in 'iu' and dtype.itemsize <= 8:
+        return b'q'
+    if dtype is not None and dtype.kind == 'f':
+        return b'd'
+    return None
+
+
+def write_binary(tree, file, kind=None):
+    '''
+    Записывает дерево в компактном двоичном формате.
+
+    tree: ArrayTree
+    file: двоичный файловый объект; для вида 'V' он должен поддерживать seek
+    kind: 'q', 'd' или 'V'; по умолчанию выбирается по типу хранилища:
+          array('q') и целые numpy - 'q', float - 'd', иначе 'V'
+
+    Значения идут в порядке уровней, поэтому узел i читается по индексу
+    без разбора остальной части файла (см. BinaryTreeFile).
+    '''
+    values = tree.values
+    if kind is None:
+        kind = _kind_of(values)
+        if kind is None:
+            kind = b'd' if len(values) and all(isinstance(_scalar(v), float) for v in values) else VARIABLE_KIND
+    elif isinstance(kind, str):
+        kind = kind.encode()
+    count = len(values)
+
+    if kind in FIXED_KINDS:
+        file.write(HEADER.pack(MAGIC, VERSION, kind, tree.height, count, 0))
+        if isinstance(values, array) and values.typecode == kind.decode() and sys.byteorder == 'little':
+            file.write(values.tobytes())  # готовое представление без поэлементной упаковки
+            return
+        if hasattr(values, 'astype'):
+            file.write(values.astype('<i8' if kind == b'q' else '<f8').tobytes())
+            return
+        packer = FIXED_KINDS[kind]
+        for value in values:
+            file.write(packer.pack(_scalar(value)))
+        return
+
+    if kind != VARIABLE_KIND:
+        raise ValueError(f"Неизвестный вид значений: {kind!r}")
+    start = file.tell()
+    file.write(HEADER.pack(MAGIC, VERSION, kind, tree.height, count, 0))
+    offsets = array('Q', [0])
+    position = 0
+    for value in values:
+        value = _scalar(value)
+        if not isinstance(value, int):
+            raise TypeError(f"Вид 'V' хранит только целые числа, получено {type(value).__name__}")
+        length = (value.bit_length() + 8) // 8  # +1 бит под знак
+        file.write(value.to_bytes(length, 'little', signed=True))
+        position += length
+        offsets.append(position)
+    table_offset = HEADER.size + position
+    for offset in offsets:
+        file.write(struct.pack('<Q', offset))
+    end = file.tell()
+    file.seek(start)
+    file.write(HEADER.pack(MAGIC, VERSION, kind, tree.height, count, table_offset))
+    file.seek(end)
+
+
+class BinaryTreeFile:
+    """
+    Дерево из файла write_binary, отображённого в память через mmap.
+
+    Значение узла читается по индексу за O(1) без загрузки всего
+    файла: в память подгружаются только затронутые страницы.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Файл {path} пуст")
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"Файл {path} слишком короткий для заголовка")
+        magic, version, kind, height, count, table_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Файл {path} не является двоичным деревом")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Неподдерживаемая версия формата: {version}")
+        if kind not in FIXED_KINDS and kind != VARIABLE_KIND:
+            self.close()
+            raise ValueError(f"Неизвестный вид значений: {kind!r}")
+        self.kind = kind.decode()
+        self.height = height
+        self._count = count
+        self._table_offset = table_offset
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i: int):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("Индекс узла вне дерева")
+        kind = self.kind.encode()
+        if kind in FIXED_KINDS:
+            return FIXED_KINDS[kind].unpack_from(self._mm, HEADER.size + 8 * i)[0]
+        begin, end = struct.unpack_from('<QQ', self._mm, self._table_offset + 8 * i)
+        return int.from_bytes(self._mm[HEADER.size + begin: HEADER.size + end], 'little', signed=True)
+
+    def value_at(self, path: str):
+        '''Значение узла по пути из корня, например "LRRL"'''
+        return self[ArrayTree.index_of(path)]
+
+    def to_array_tree(self) -> ArrayTree:
+        '''Загружает всё дерево в память'''
+        values = [self[i] for i in range(self._count)]
+        if self.kind in ('q', 'd'):
+            values = array(self.kind, values)
+        return ArrayTree(self.height, values)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
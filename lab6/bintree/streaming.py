@@ -0,0 +1,71 @@
+from .branches import left_branch, right_branch
+
+
+def index_to_path(index: int) -> str:
+    '''Путь из корня ("LRR...") к узлу с индексом index в неявной куче'''
+    path = []
+    while index > 0:
+        path.append('L' if index % 2 else 'R')
+        index = (index - 1) // 2
+    return ''.join(reversed(path))
+
+
+def _check_height(height):
+    if type(height) != int or height < 0:
+        raise ValueError("Высота дерева должна быть неотрицательным целым числом")
+
+
+def iter_bfs(height = 3, root = 11, l_b=left_branch, r_b=right_branch):
+    '''
+    Генератор узлов дерева в порядке обхода в ширину.
+
+    Выдаёт кортежи (index, level, value), где index - номер узла
+    в неявной куче (потомки узла i - 2i+1 и 2i+2), level - уровень
+    (корень на уровне 0). В памяти хранится только текущий уровень
+    и строящийся следующий, а не всё дерево.
+    '''
+    _check_height(height)
+    if height == 0:
+        return
+    level_values = [root]
+    index = 0
+    for level in range(height):
+        last = level == height - 1
+        next_values = []
+        for value in level_values:
+            yield index, level, value
+            index += 1
+            if not last:
+                next_values.append(l_b(value))
+                next_values.append(r_b(value))
+        level_values = next_values
+
+
+def iter_dfs(height = 3, root = 11, l_b=left_branch, r_b=right_branch):
+    '''
+    Генератор узлов дерева в прямом порядке обхода в глубину
+    (узел, левое поддерево, правое поддерево).
+
+    Выдаёт кортежи (index, level, value) как iter_bfs. На стеке
+    одновременно не больше height + 1 узлов, то есть память O(height).
+    '''
+    _check_height(height)
+    if height == 0:
+        return
+    stack = [(0, 0, root)]
+    while stack:
+        index, level, value = stack.pop()
+        yield index, level, value
+        if level + 1 < height:
+            # правый кладём первым, чтобы левый обошёлся раньше
+            stack.append((2 * index + 2, level + 1, r_b(value)))
+            stack.append((2 * index + 1, level + 1, l_b(value)))
+
+
+def iter_nodes(height = 3, root = 11, l_b=left_branch, r_b=right_branch, order='bfs'):
+    '''Генератор узлов дерева в порядке order: "bfs" или "dfs"'''
+    if order == 'bfs':
+        return iter_bfs(height, root, l_b, r_b)
+    if order == 'dfs':
+        return iter_dfs(height, root, l_b, r_b)
+    raise ValueError(f"Неизвестный порядок обхода: {order!r}")
@@ -0,0 +1,138 @@
+from .array_tree import ArrayTree
+from .branches import left_branch, right_branch
+
+try:
+    import numpy as np
+except ImportError:  # без numpy уровни строятся списками
+    np = None
+
+# Запас до 2**63: приближённое значение во float64 сравнивается с этим порогом
+_INT64_SAFE = float(2 ** 62)
+
+
+def _apply(func, level):
+    '''Применяет ветвящую функцию ко всему уровню, поэлементно - если она не векторизуется'''
+    try:
+        result = func(level)
+    except (TypeError, ValueError):
+        result = None
+    if result is None or np.shape(result) != level.shape:
+        result = np.array([func(x) for x in level.tolist()], dtype=object)
+    return result
+
+
+def _int64_children(level, l_b, r_b):
+    '''
+    Потомки уровня int64 или None, если int64 их не выдерживает.
+
+    В int64 numpy переполняется молча, поэтому функции применяются ещё и
+    к копии во float64: результат должен быть меньше 2**62 по модулю и
+    совпадать с int64. Расхождение значит, что переполнилось промежуточное
+    значение (например, x*x внутри (x*x + 7) % p).
+    '''
+    approx = level.astype(np.float64)
+    try:
+        with np.errstate(all='ignore'):
+            expected = [_apply(l_b, approx).astype(np.float64), _apply(r_b, approx).astype(np.float64)]
+            children = [_apply(l_b, level), _apply(r_b, level)]
+    except (TypeError, ValueError, ArithmeticError):
+        # функция только для целых (&, ^, << ...) - проверить нельзя, считаем точно
+        return None
+    for child, approx_child in zip(children, expected):
+        if not np.all(np.abs(approx_child) < _INT64_SAFE):
+            return None
+        if child.dtype == np.int64 and not np.allclose(child.astype(np.float64), approx_child,
+                                                       rtol=1e-9, atol=0.5):
+            return None
+    return children
+
+
+def _float_children(level, l_b, r_b):
+    '''
+    Потомки уровня float64 или None, если где-то получилось inf или nan
+    из конечного значения: тогда уровень считается как float Python,
+    чтобы переполнение вело себя так же, как в остальных представлениях
+    (например, x ** 2 выбрасывает OverflowError).
+    '''
+    with np.errstate(all='ignore'):
+        children = [_apply(l_b, level), _apply(r_b, level)]
+    if not np.all(np.isfinite(level)):
+        return children
+    for child in children:
+        if child.dtype == np.float64 and not np.all(np.isfinite(child)):
+            return None
+    return children
+
+
+def _next_level(level, l_b, r_b):
+    '''Следующий уровень: потомки каждого узла парами (левый, правый)'''
+    children = None
+    if level.dtype == np.int64:
+        children = _int64_children(level, l_b, r_b)
+    elif level.dtype == np.float64:
+        children = _float_children(level, l_b, r_b)
+    if children is None and level.dtype != object:
+        level = level.astype(object)  # дальше точная арифметика чисел Python
+    if children is None:
+        # для объектов numpy тоже проверяет флаги FPU; inf здесь - как во float Python
+        with np.errstate(over='ignore', invalid='ignore'):
+            children = [_apply(l_b, level), _apply(r_b, level)]
+    left, right = children
+    dtype = level.dtype if left.dtype == right.dtype == level.dtype else object
+    nxt = np.empty(2 * len(level), dtype=dtype)
+    nxt[0::2] = left
+    nxt[1::2] = right
+    return nxt
+
+
+def _levels_python(height, root, l_b, r_b):
+    level = [root]
+    yield level
+    for _ in range(height - 1):
+        nxt = []
+        for x in level:
+            nxt.append(l_b(x))
+            nxt.append(r_b(x))
+        level = nxt
+        yield level
+
+
+def build_tree_vectorized(height = 3, root = 11, l_b=left_branch, r_b=right_branch):
+    '''
+    Функция, создающая бинарное дерево уровнями с помощью numpy
+    height: высота дерева
+    root: значение корневого узла
+    l_b: функция для вычисления левого потомка, принимающая массив уровня
+         (например, lambda x: x ** 2); невекторизуемые функции
+         применяются поэлементно
+    r_b: функция для вычисления правого потомка
+
+    Пока значения помещаются в int64, уровень считается одной операцией
+    numpy над массивом; при угрозе переполнения уровень переводится в
+    dtype=object и значения считаются точно как int Python.
+    Без numpy уровни строятся списками. Возвращает ArrayTree.
+    '''
+
+    if type(height) != int or height < 0:
+        raise ValueError("Высота дерева должна быть неотрицательным целым числом")
+    if height == 0:
+        return None
+
+    if np is None:
+        values = []
+        for level in _levels_python(height, root, l_b, r_b):
+            values.extend(level)
+        return ArrayTree(height, values)
+
+    if isinstance(root, int) and abs(root) < _INT64_SAFE:
+        level = np.array([root], dtype=np.int64)
+    elif isinstance(root, int):
+        level = np.array([root], dtype=object)
+    else:
+        level = np.array([root], dtype=np.float64)
+    levels = [level]
+    for _ in range(height - 1):
+        level = _next_level(level, l_b, r_b)
+        levels.append(level)
+    dtype = object if any(lv.dtype == object for lv in levels) else levels[-1].dtype
+    return ArrayTree(height, np.concatenate(levels).astype(dtype, copy=False))
@@ -1,52 +1,95 @@
-from bin_rec import build_tree_recursive, left_branch, right_branch
-from bin_non_rec import build_tree_iterative
-
-import timeit
-import matplotlib.pyplot as plt
+import os
+import sys
 import random
+from functools import partial
+
+from bintree import build_tree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench import (make_parser, run, run_scaling, growth_reports, write_json, write_csv,
+                   SCALING_FIELDS)
 
 '''
-    bin_rec: рекурсивная реализация дерева
-    bin_non_rec: итеративная реализация дерева
-    timeit: для измерения времени выполнения
-    matplotlib.pyplot: для построения графиков
+    bintree: реализации дерева, выбираемые параметром backend
+    bench: общие средства замеров (статистика, память, JSON/CSV, графики, базовая линия)
     '''
 
-def benchmark(func, n, repeat=5):
-    """Возвращает среднее время выполнения func(n)"""
-    times = timeit.repeat(lambda: func(n), number=1, repeat=repeat)
-    return min(times)
-    '''
-       Выполняет функцию func и возвращает минимальное среднее время выполнения.
-       Параметры:
-       func: функция, которую необходимо протестировать
-       n: размер данных
-       repeat: количество повторений замера
-      '''
-
-def main():
+# Серии для сравнения: подпись на графике -> представление дерева в build_tree
+BACKEND_LABELS = {
+    "Рекурсивный": "dict_recursive",
+    "Итеративный": "dict",
+    "Массив (неявная куча)": "array",
+    "Уровни numpy": "vectorized",
+    "Общие поддеревья": "shared",
+}
+
+# Ограничение значений для всех замеров: при x**2 размер чисел удваивается
+# с каждым уровнем, и уже высота 18 считается десятки минут, а рост времени
+# и памяти перестаёт зависеть только от числа узлов
+BOUND = 1000003
+
+
+def bounded_left(x):
+    return (x * 3 + 1) % BOUND
+
+
+def bounded_right(x):
+    return (x * x + 7) % BOUND
+
+
+def run_scaling_suite(args) -> int:
+    """
+    Замеры времени и памяти по высотам для каждого представления.
+    Возвращает 1, если рост времени или памяти сверхлинейный по числу узлов.
+    """
+    funcs = {backend: partial(build_tree, l_b=bounded_left, r_b=bounded_right, backend=backend)
+             for backend in args.backends}
+    results = run_scaling(funcs, args.heights, items_of=lambda h: 2 ** h - 1,
+                          isolate=not args.no_isolate)
+
+    print(f"{'представление':<16}{'высота':>7}{'узлов':>10}{'время, с':>11}{'узлов/с':>12}"
+          f"{'tracemalloc':>13}{'байт/узел':>11}{'RSS':>13}{'блоков/узел':>13}")
+    for name, points in results.items():
+        for p in points:
+            rss = '-' if p.rss_peak is None else p.rss_peak
+            blocks = '-' if p.blocks_per_item is None else f"{p.blocks_per_item:.2f}"
+            print(f"{name:<16}{p.n:>7}{p.items:>10}{p.seconds:>11.4f}{p.items_per_second:>12.0f}"
+                  f"{p.tracemalloc_peak:>13}{p.bytes_per_item:>11.1f}{rss:>13}{blocks:>13}")
+
+    reports = growth_reports(results)
+    print()
+    for report in reports:
+        print(report)
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv, SCALING_FIELDS)
+    return 1 if any(report.superlinear for report in reports) else 0
+
+
+def main(argv=None):
+    parser = make_parser("Сравнение построения бинарного дерева")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKEND_LABELS.values()),
+                        default=list(BACKEND_LABELS.values()), help="сравниваемые представления")
+    parser.add_argument("--scaling", action="store_true",
+                        help="замеры масштабируемости: время, память, блоки на узел, рост от числа узлов")
+    parser.add_argument("--heights", nargs="+", type=int, default=list(range(8, 21, 2)),
+                        help="высоты для --scaling")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="при --scaling не запускать каждый замер в отдельном процессе")
+    args = parser.parse_args(argv)
+    if args.scaling:
+        return run_scaling_suite(args)
+    # partial от функции уровня модуля передаётся в процессы при --jobs
+    funcs = {label: partial(build_tree, l_b=bounded_left, r_b=bounded_right, backend=backend)
+             for label, backend in BACKEND_LABELS.items() if backend in args.backends}
     # Фиксированный набор данных
     random.seed(2)
     # Создание тестовых данных: числа с шагом 2
     test_data = list(range(2, 20, 2))
 
-    # Списки для хранения результатов
-    res_recursive = []
-    res_iterative = []
-
-    for n in test_data:
-      res_recursive.append(benchmark(build_tree_recursive,n)) # Замеры времени для рекурсивной генерации
-      res_iterative.append(benchmark(build_tree_iterative,n)) # Замеры времени для итеративной генерации
-
-    # Визуализация
-    plt.plot(test_data, res_recursive, label="Рекурсивный")
-    plt.plot(test_data, res_iterative, label="Итеративный")
-    plt.xlabel("n")
-    plt.ylabel("Время (сек)")
-    plt.title("Сравнение рекурсивного и итеративного дерева")
-    plt.legend()
-    plt.show()
+    return run(funcs, test_data, args, title="Сравнение рекурсивного и итеративного дерева", xlabel="n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,411 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+from bintree import (ArrayTree, build_tree_array, build_tree_vectorized, LazyTree, build_tree_lazy,
+                     index_to_path, iter_bfs, iter_dfs, iter_nodes, build_tree_shared,
+                     build_tree_parallel, BinaryTreeFile, iter_json, write_binary,
+                     MmapTree, build_tree_mmap, BACKENDS, build_tree, build_tree_dict,
+                     register_backend, Reducer, LevelSum, LevelMinMax, LeafCount, Histogram,
+                     build_and_reduce)
+
+
+def load_script(file_name):
+    """Загружает файл лабораторной (имена вида lab6.1.py не импортируются напрямую)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(file_name.replace('.', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lab6 = load_script('lab6.py')
+
+
+class TestArrayTree(unittest.TestCase):
+
+    def test_matches_dict_builder(self):
+        """to_dict совпадает с результатом build_tree_iterative"""
+        for height in range(2, 7):
+            self.assertEqual(build_tree_array(height).to_dict(),
+                             lab6.build_tree_iterative(height))
+
+    def test_heap_layout(self):
+        """Потомки узла i хранятся в 2i+1 и 2i+2"""
+        tree = build_tree_array(4, 1, lambda x: x + 1, lambda x: x * 2)
+        self.assertEqual(len(tree), 15)
+        self.assertEqual(tree[tree.left(0)], 2)
+        self.assertEqual(tree[tree.right(0)], 2)
+        self.assertEqual(tree.value_at('RL'), 3)
+        self.assertEqual(tree.parent(tree.index_of('RL')), 2)
+        self.assertEqual(tree.level(tree.index_of('LRR')), 3)
+        self.assertTrue(tree.is_leaf(14))
+        self.assertIsNone(tree.left(14))
+        with self.assertRaises(IndexError):
+            tree.value_at('LLLL')
+
+    def test_storage_fallback(self):
+        """Значения вне int64 переводят хранилище из array в list"""
+        self.assertEqual(build_tree_array(3, 2).values.typecode, 'q')
+        tree = build_tree_array(7)
+        self.assertIsInstance(tree.values, list)
+        self.assertEqual(tree.value_at('LLLLLL'), 11 ** 64)
+
+    def test_empty_and_invalid(self):
+        """Высота 0 даёт None, отрицательная высота - ValueError"""
+        self.assertIsNone(build_tree_array(0))
+        with self.assertRaises(ValueError):
+            build_tree_array(-1)
+        with self.assertRaises(ValueError):
+            ArrayTree(2, [1])
+
+
+class TestVectorized(unittest.TestCase):
+
+    def test_matches_array_builder(self):
+        """Значения совпадают с поэлементным построением, в том числе после переполнения int64"""
+        cases = [
+            (8, 11, lambda x: x ** 2, lambda x: 2 + x ** 2),
+            (6, -3, lambda x: x * 3, lambda x: x - 1),
+            (5, 1.5, lambda x: x ** 2, lambda x: 2 + x ** 2),
+            (4, 2, lambda x: 7, abs),
+            (5, 5, lambda x: x & 0xFF, lambda x: (x * 7) % 13),
+            (5, 3, lambda x: (x << 1) ^ 5, lambda x: x | 1),
+            # промежуточное x*x переполняет int64, хотя результат мал
+            (5, 10 ** 12, lambda x: (x * x + 7) % 1000003, lambda x: (x * 3 + 1) % 1000003),
+        ]
+        for height, root, l_b, r_b in cases:
+            expected = build_tree_array(height, root, l_b, r_b)
+            tree = build_tree_vectorized(height, root, l_b, r_b)
+            self.assertEqual(list(tree.values), list(expected.values))
+            self.assertEqual(tree.to_dict(), expected.to_dict())
+
+    def test_float_overflow(self):
+        """Переполнение float ведёт себя так же, как в поэлементном построении"""
+        with self.assertRaises(OverflowError):
+            build_tree_array(12, 1.5, lambda x: x ** 2, lambda x: x + 1)
+        with self.assertRaises(OverflowError):
+            build_tree_vectorized(12, 1.5, lambda x: x ** 2, lambda x: x + 1)
+        expected = build_tree_array(12, 1.5, lambda x: x * x, lambda x: x + 1)
+        tree = build_tree_vectorized(12, 1.5, lambda x: x * x, lambda x: x + 1)
+        self.assertEqual(list(tree.values), list(expected.values))
+
+    def test_empty(self):
+        """Высота 0 даёт None"""
+        self.assertIsNone(build_tree_vectorized(0))
+
+
+class TestLazyTree(unittest.TestCase):
+
+    def test_matches_dict_builder(self):
+        """Полное раскрытие совпадает с build_tree_iterative"""
+        for height in range(2, 6):
+            self.assertEqual(build_tree_lazy(height).to_dict(),
+                             lab6.build_tree_iterative(height))
+
+    def test_path_query_on_tall_tree(self):
+        """Запрос по пути в дереве высоты 60 требует O(height) вызовов"""
+        calls = []
+
+        def l_b(x):
+            calls.append(x)
+            return x + 1
+
+        tree = LazyTree(60, 0, l_b, lambda x: x * 2)
+        self.assertEqual(tree.leftmost_leaf(), 59)
+        self.assertEqual(len(calls), 59)
+        self.assertEqual(tree.value_at('LRRL'), 5)
+        self.assertEqual(tree.rightmost_leaf(), 0)
+
+    def test_memoize(self):
+        """С мемоизацией узел вычисляется один раз, без неё - при каждом обращении"""
+        for memoize, expected_calls in ((True, 1), (False, 3)):
+            calls = []
+            tree = LazyTree(3, 1, lambda x: calls.append(x) or x, abs, memoize=memoize)
+            for _ in range(3):
+                tree.value_at('L')
+            self.assertEqual(len(calls), expected_calls)
+
+    def test_bounds(self):
+        """Путь длиннее высоты и неизвестный шаг дают ошибку, лист не имеет потомков"""
+        tree = LazyTree(3)
+        with self.assertRaises(IndexError):
+            tree.value_at('LLL')
+        with self.assertRaises(ValueError):
+            tree.value_at('X')
+        self.assertIsNone(tree.node_at('LL').left)
+        self.assertIsNone(build_tree_lazy(0))
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_bfs_matches_array_layout(self):
+        """Обход в ширину выдаёт узлы в порядке неявной кучи"""
+        tree = build_tree_array(5)
+        nodes = list(iter_bfs(5))
+        self.assertEqual([i for i, _, _ in nodes], list(range(len(tree))))
+        self.assertEqual([v for _, _, v in nodes], list(tree.values))
+        self.assertEqual([lvl for i, lvl, _ in nodes], [tree.level(i) for i in range(len(tree))])
+
+    def test_dfs_preorder(self):
+        """Обход в глубину - прямой порядок с теми же индексами и значениями"""
+        tree = build_tree_array(4, 1, lambda x: x + 1, lambda x: x * 3)
+        nodes = list(iter_dfs(4, 1, lambda x: x + 1, lambda x: x * 3))
+        self.assertEqual([i for i, _, _ in nodes][:5], [0, 1, 3, 7, 8])
+        self.assertEqual(sorted(i for i, _, _ in nodes), list(range(15)))
+        for index, level, value in nodes:
+            self.assertEqual(tree[index], value)
+            self.assertEqual(tree.value_at(index_to_path(index)), value)
+            self.assertEqual(len(index_to_path(index)), level)
+
+    def test_orders_and_empty(self):
+        """Пустое дерево ничего не выдаёт, неизвестный порядок - ValueError"""
+        self.assertEqual(list(iter_nodes(0, order='dfs')), [])
+        self.assertEqual(list(iter_nodes(1)), [(0, 0, 11)])
+        with self.assertRaises(ValueError):
+            iter_nodes(3, order='inorder')
+
+
+class TestSharedTree(unittest.TestCase):
+
+    def test_matches_dict_builder(self):
+        """Развёрнутый граф совпадает с build_tree_iterative"""
+        for height in range(1, 6):
+            dag = build_tree_shared(height, -2)
+            self.assertEqual(dag.to_dict(), build_tree_array(height, -2).to_dict())
+            self.assertEqual(dag.total_nodes, 2 ** height - 1)
+
+    def test_repeated_values_are_shared(self):
+        """Повторяющиеся значения строятся один раз"""
+        l_b = lambda x: (x * 3) % 7
+        r_b = lambda x: (x + 5) % 7
+        dag = build_tree_shared(60, 1, l_b, r_b)
+        self.assertLessEqual(dag.unique_nodes, 7 * 60)
+        self.assertEqual(dag.value_at('LRRL'), build_tree_array(5, 1, l_b, r_b).value_at('LRRL'))
+        # путь LR и RL ведёт к одному значению 0 на одной высоте
+        dag = build_tree_shared(4, 0, lambda x: x - 3, lambda x: x + 3)
+        self.assertIs(dag.root.left.right, dag.root.right.left)
+
+    def test_bounded_cache(self):
+        """Даже с крошечным кэшем результат верный"""
+        dag = build_tree_shared(6, 1, lambda x: x % 3, lambda x: (x + 1) % 3, max_cache=1)
+        self.assertEqual(dag.to_dict(),
+                         build_tree_array(6, 1, lambda x: x % 3, lambda x: (x + 1) % 3).to_dict())
+
+    def test_type_in_key(self):
+        """1 и 1.0 не считаются одним поддеревом"""
+        dag = build_tree_shared(2, 1, lambda x: 1, lambda x: 1.0)
+        self.assertIsInstance(dag.root.right.value, float)
+        self.assertIsInstance(dag.root.left.value, int)
+
+
+def mod_left(x):
+    return (x * 3 + 1) % 1000003
+
+
+def mod_right(x):
+    return (x * x + 7) % 1000003
+
+
+class TestParallelTree(unittest.TestCase):
+
+    def test_matches_array_builder(self):
+        """Склеенное дерево совпадает с последовательным при любой глубине разбиения"""
+        for height in (1, 4, 7):
+            expected = list(build_tree_array(height, 1, mod_left, mod_right).values)
+            for split_depth in range(0, height + 1):
+                tree = build_tree_parallel(height, 1, mod_left, mod_right,
+                                           split_depth=split_depth, workers=2)
+                self.assertEqual(list(tree.values), expected)
+
+    def test_big_values(self):
+        """Значения вне int64 передаются списком и склеиваются верно"""
+        tree = build_tree_parallel(6, split_depth=2, workers=2)
+        self.assertEqual(tree.to_dict(), lab6.build_tree_iterative(6))
+
+
+class TestSerialize(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.btree')
+        os.close(handle)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_json_stream(self):
+        """Потоковый JSON совпадает с json.dumps(to_dict())"""
+        for height in range(1, 7):
+            tree = build_tree_array(height)
+            self.assertEqual(''.join(iter_json(tree)), json.dumps(tree.to_dict()))
+
+    def test_binary_roundtrip(self):
+        """Все виды значений читаются обратно по индексу"""
+        trees = {
+            'q': build_tree_array(6, -3, lambda x: x * 3, lambda x: x - 1),
+            'd': build_tree_array(5, 1.5),
+            'V': build_tree_array(7),
+        }
+        for kind, tree in trees.items():
+            with open(self.path, 'wb') as f:
+                write_binary(tree, f)
+            with BinaryTreeFile(self.path) as stored:
+                self.assertEqual(stored.kind, kind)
+                self.assertEqual(stored.height, tree.height)
+                self.assertEqual([stored[i] for i in range(len(stored))], list(tree.values))
+                self.assertEqual(stored.value_at('LR'), tree.value_at('LR'))
+                self.assertEqual(stored[-1], tree[len(tree) - 1])
+                self.assertEqual(''.join(iter_json(stored)), json.dumps(tree.to_dict()))
+                with self.assertRaises(IndexError):
+                    stored[len(tree)]
+
+    def test_not_a_tree_file(self):
+        """Чужой файл не открывается"""
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 64)
+        with self.assertRaises(ValueError):
+            BinaryTreeFile(self.path)
+
+
+class TestMmapTree(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.btree')
+        os.close(handle)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def test_matches_array_builder(self):
+        """Дерево в файле совпадает с ArrayTree при любом размере блока"""
+        expected = build_tree_array(8, 1, mod_left, mod_right)
+        for chunk in (1, 3, 1000):
+            with build_tree_mmap(self.path, 8, 1, mod_left, mod_right, chunk=chunk) as tree:
+                self.assertEqual(list(tree.read_range(0, len(tree))), list(expected.values))
+                self.assertEqual(tree.value_at('RLR'), expected.value_at('RLR'))
+                self.assertEqual(list(tree.level_values(3)), list(expected.level_values(3)))
+
+    def test_reopen_and_binary_reader(self):
+        """Файл открывается повторно и читается через BinaryTreeFile"""
+        build_tree_mmap(self.path, 5, 0.5, kind='d').close()
+        expected = build_tree_array(5, 0.5)
+        with MmapTree(self.path) as tree:
+            self.assertEqual(tree.kind, 'd')
+            self.assertEqual(tree[-1], expected[len(expected) - 1])
+        with BinaryTreeFile(self.path) as stored:
+            self.assertEqual([stored[i] for i in range(len(stored))], list(expected.values))
+
+    def test_short_file(self):
+        """Файл короче заголовка даёт ValueError, а не struct.error"""
+        with open(self.path, 'wb') as f:
+            f.write(b'BT')
+        with self.assertRaises(ValueError):
+            MmapTree(self.path)
+
+    def test_overflow(self):
+        """Выход за int64 даёт OverflowError, недостроенный файл удаляется"""
+        with self.assertRaises(OverflowError):
+            build_tree_mmap(self.path, 8)
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestBuildTree(unittest.TestCase):
+
+    def to_dict(self, tree):
+        return tree if tree is None or isinstance(tree, dict) else tree.to_dict()
+
+    def test_backends_agree(self):
+        """Все представления строят одно и то же дерево"""
+        for height in range(0, 6):
+            expected = build_tree_dict(height, 3, mod_left, mod_right)
+            for backend in BACKENDS:
+                options = {}
+                if backend == 'mmap':
+                    if height == 0:
+                        continue
+                    handle, options['path'] = tempfile.mkstemp(suffix='.btree')
+                    os.close(handle)
+                if backend == 'parallel':
+                    options['workers'] = 2
+                tree = build_tree(height, 3, mod_left, mod_right, backend=backend, **options)
+                if backend == 'mmap':
+                    self.assertEqual(list(tree.read_range(0, len(tree))),
+                                     list(build_tree_array(height, 3, mod_left, mod_right).values))
+                    tree.close()
+                    os.unlink(options['path'])
+                else:
+                    self.assertEqual(self.to_dict(tree), expected, backend)
+
+    def test_dict_format(self):
+        """Формат словарей совпадает с build_tree_iterative, корень без потомков явный"""
+        self.assertEqual(build_tree(5), lab6.build_tree_iterative(5))
+        self.assertEqual(build_tree(1), {'value': 11, 'left': None, 'right': None})
+        self.assertEqual(build_tree(1, backend='dict_recursive'), build_tree(1))
+
+    def test_validation(self):
+        """Неверные аргументы дают TypeError/ValueError вместо строки с ошибкой"""
+        for kwargs in ({'height': '3'}, {'height': True}, {'root': '11'}, {'root': None},
+                       {'l_b': 5}):
+            with self.assertRaises(TypeError):
+                build_tree(**kwargs)
+        with self.assertRaises(ValueError):
+            build_tree(-1)
+        with self.assertRaises(ValueError):
+            build_tree(3, backend='unknown')
+
+    def test_register_backend(self):
+        """Новое представление подключается по имени"""
+        register_backend('count', lambda height, root, l_b, r_b: 2 ** height - 1)
+        try:
+            self.assertEqual(build_tree(4, backend='count'), 15)
+        finally:
+            del BACKENDS['count']
+
+
+class TestBuildAndReduce(unittest.TestCase):
+
+    def test_aggregates_match_materialized_tree(self):
+        """Агрегаты совпадают с подсчётом по построенному дереву"""
+        tree = build_tree_array(7, 3, mod_left, mod_right)
+        leaves = list(tree.level_values(6))
+        for order in ('bfs', 'dfs'):
+            result = build_and_reduce(7, 3, mod_left, mod_right, order=order, reducers={
+                'sum': LevelSum(),
+                'bounds': LevelMinMax(),
+                'leaves': LeafCount(),
+                'even_leaves': LeafCount(lambda x: x % 2 == 0),
+                'hist': Histogram(bin_width=100000, leaves_only=True),
+            })
+            self.assertEqual(result['sum'], [sum(tree.level_values(lvl)) for lvl in range(7)])
+            self.assertEqual(result['bounds'],
+                             [(min(tree.level_values(lvl)), max(tree.level_values(lvl))) for lvl in range(7)])
+            self.assertEqual(result['leaves'], 64)
+            self.assertEqual(result['even_leaves'], sum(1 for x in leaves if x % 2 == 0))
+            self.assertEqual(sum(result['hist'].values()), 64)
+            self.assertEqual(result['hist'].get(leaves[0] // 100000, 0),
+                             sum(1 for x in leaves if x // 100000 == leaves[0] // 100000))
+
+    def test_list_form_and_empty(self):
+        """Список редукторов даёт список результатов, пустое дерево - пустые агрегаты"""
+        self.assertEqual(build_and_reduce(3, 1, abs, abs, [Histogram(key=str)]), [{'1': 7}])
+        self.assertEqual(build_and_reduce(0, reducers=[LevelSum(), LeafCount()]), [[], 0])
+        with self.assertRaises(ValueError):
+            Histogram(bin_width=1, key=str)
+
+    def test_reducer_is_abstract(self):
+        """Редуктор без add или result не создаётся"""
+        class NoResult(Reducer):
+            def add(self, index, level, value):
+                pass
+
+        with self.assertRaises(TypeError):
+            Reducer()
+        with self.assertRaises(TypeError):
+            NoResult()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,127 @@
+import copy
+import threading
 import requests
 import xml.etree.ElementTree as ET
 from typing import Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from models.currency import Currency
 
 CBR_DAILY_URL = "http://www.cbr.ru/scripts/XML_daily.asp"
 
+# Таймауты запроса к ЦБ: (соединение, чтение), секунды
+TIMEOUT = (3.05, 5)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с таймаутом по умолчанию"""
+
+    def __init__(self, timeout=TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+# Один пул соединений (keep-alive) на процесс: повторы GET при ошибках
+# соединения и ответах 429/5xx с растущей паузой
+_ADAPTER = TimeoutHTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']), raise_on_status=False),
+    pool_maxsize=16,
+)
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """
+    Session текущего потока, использующая общий пул соединений.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.mount('http://', _ADAPTER)
+        session.mount('https://', _ADAPTER)
+    return session
+
+
+class _Flight:
+    """Выполняющийся запрос: результат или исключение и событие завершения"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _own_error(error: BaseException) -> BaseException:
+    """
+    Копия исключения для ожидающего потока: raise добавляет кадры потока
+    в __traceback__, поэтому общий объект у нескольких потоков даёт
+    перемешанную трассировку. Исходное исключение - в __cause__.
+    """
+    try:
+        own = copy.copy(error)
+    except Exception:
+        return error
+    own.__traceback__ = None
+    own.__cause__ = error
+    return own
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight(key: str, func):
+    """
+    Выполняет func() один раз для всех одновременных вызовов с ключом key.
+
+    Остальные потоки ждут первого и получают его результат
+    или копию его исключения (исходное - в __cause__).
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise _own_error(flight.error)
+        return flight.result
+
+    try:
+        flight.result = func()
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+    return flight.result
+
 
 def get_currencies() -> Dict[str, Currency]:
     """
     Получает актуальные курсы валют с API ЦБ РФ и преобразует их в словарь объектов Currency.
 
+    Одновременные вызовы (например, из разных потоков сервера) делают
+    один запрос к ЦБ и получают его результат.
+
     Возвращает:
         Dict[str, Currency]: Словарь
     """
+    # у каждого вызывающего своя копия словаря, объекты Currency общие
+    return dict(single_flight(CBR_DAILY_URL, _fetch_currencies))
+
+
+def _fetch_currencies() -> Dict[str, Currency]:
+    """Запрос к ЦБ и разбор ответа (см. get_currencies)"""
     try:
-        response = requests.get(CBR_DAILY_URL, timeout=5)
+        response = get_session().get(CBR_DAILY_URL)
         response.raise_for_status()
 
         root = ET.fromstring(response.content)
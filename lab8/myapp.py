@@ -1,5 +1,5 @@
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 from jinja2 import Environment, PackageLoader, select_autoescape
 from import Author, App, User, Currency, UserCurrency
@@ -267,7 +267,7 @@ class SimpleHTTPController(BaseHTTPRequestHandler):
         self.wfile.write(html_content.encode('utf-8'))
 
 
-def run(server_class=HTTPServer, handler_class=SimpleHTTPController, port=8000):
+def run(server_class=ThreadingHTTPServer, handler_class=SimpleHTTPController, port=8000):
     """Запускает HTTP-сервер."""
 
     setup_initial_data()
@@ -1,8 +1,10 @@
 import unittest
 from unittest.mock import patch
 from models import Author, User, Currency, UserCurrency
-from utils.currencies_api import get_currencies
+from currencies_api import get_currencies, single_flight
 import requests
+import threading
+import time
 
 
 class TestModels(unittest.TestCase):
@@ -98,8 +100,9 @@ class MockResponse:
 class TestCurrenciesApi(unittest.TestCase):
     """Тестирование утилиты для работы с API курсов валют."""
 
-    @patch('utils.currencies_api.requests.get')
-    def test_get_currencies_success(self, mock_get):
+    @patch('currencies_api.get_session')
+    def test_get_currencies_success(self, mock_session):
+        mock_get = mock_session.return_value.get
         mock_get.return_value = MockResponse(MOCK_XML_RESPONSE)
 
         currencies = get_currencies()
@@ -115,11 +118,12 @@ class TestCurrenciesApi(unittest.TestCase):
         self.assertEqual(currencies['EUR'].name, "Евро")
         self.assertEqual(currencies['RUB'].value, 1.0)
 
-    @patch('utils.currencies_api.requests.get')
-    def test_get_currencies_api_error(self, mock_get):
+    @patch('currencies_api.get_session')
+    def test_get_currencies_api_error(self, mock_session):
         """
         Проверка обработки ошибки HTTP-запроса.
         """
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = requests.exceptions.RequestException("Mock HTTP Error")
 
         currencies = get_currencies()
@@ -127,5 +131,81 @@ class TestCurrenciesApi(unittest.TestCase):
         self.assertEqual(currencies, {})
 
 
+class TestSingleFlight(unittest.TestCase):
+    """Тестирование объединения одновременных запросов."""
+
+    def run_concurrently(self, result, count=5):
+        """
+        Запускает count потоков с single_flight('key', ...): первый выполняет
+        запрос, остальные подключаются, пока он не завершён.
+        Возвращает число выполненных запросов и результаты потоков.
+        """
+        entered = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def fetch():
+            calls.append(1)
+            entered.set()
+            release.wait(5)
+            return result()
+
+        def worker():
+            try:
+                results.append(single_flight('key', fetch))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        threads[0].start()
+        entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return len(calls), results
+
+    def test_one_call_for_concurrent_callers(self):
+        calls, results = self.run_concurrently(lambda: {'USD': 90.0})
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [{'USD': 90.0}] * 5)
+
+    def test_error_reaches_all_waiters(self):
+        def failing():
+            raise ValueError("upstream down")
+
+        calls, results = self.run_concurrently(failing)
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+            self.assertEqual(str(result), "upstream down")
+
+        # у каждого потока своё исключение, исходное - в __cause__ у ждавших
+        self.assertEqual(len({id(result) for result in results}), 5)
+        original = [result for result in results if result.__cause__ is None]
+        self.assertEqual(len(original), 1)
+        for result in results:
+            if result is not original[0]:
+                self.assertIs(result.__cause__, original[0])
+
+        # после завершения следующий вызов снова обращается к источнику
+        self.assertEqual(single_flight('key', lambda: 'fresh'), 'fresh')
+
+    @patch('currencies_api.get_session')
+    def test_get_currencies_returns_copies(self, mock_session):
+        mock_session.return_value.get.return_value = MockResponse(MOCK_XML_RESPONSE)
+
+        first = get_currencies()
+        first.pop('USD')
+
+        self.assertIn('USD', get_currencies())
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file